@@ -8,11 +8,11 @@ Date      : 15 May 2016
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib
 import datetime
-import urllib.request
-import urllib as UL
+import calc_SeaIceRecords as CR
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -22,15 +22,8 @@ currentdy = str(now.day-1)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = urllib.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -121,12 +114,8 @@ if (currentyear[lastday]*1e6) < np.nanmin(mean2000):
     print(True, '2000')
     
 ### Calculate record low SIE
-recordlow = np.empty((years.shape[0]))
-for i in range(years.shape[0]):
-    if years[i,-1] == np.nanmin(years[i,:]):
-        recordlow[i] = 1.
-    else: 
-        recordlow[i] = 0.
+record,previous,holder,margin,count = CR.calcRunningRecords(years,'low')
+recordlow = record[:,-1].astype(float)
 
 ### Begin plot
 plt.plot(doy,years[:,:],color='w',linewidth=0.15,
@@ -8,12 +8,11 @@ Date      : 4 August 2016
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import matplotlib
 import datetime
-import urllib.request
-import urllib as UL
 
 ### Directory and time
 directory = './Figures/'
@@ -24,15 +23,8 @@ currentdy = str(now.day-1)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -9,11 +9,11 @@ Date      : 20 August 2017
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib
 import datetime
-import urllib.request
-import urllib as UL
+import calc_SeaIceRecords as CR
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -23,15 +23,8 @@ currentdy = str(now.day-1)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -113,13 +106,7 @@ average1980s[lastday:] = mean1980[lastday]
 average1980s = average1980s/1e6
 
 ### Find climatological mins
-minyr = np.empty((years.shape[1]))
-for i in range(years.shape[1]):
-    minyr[i] = np.nanmin(years[:,i])
-    
-minwhere = np.empty((years.shape[1]))
-for i in range(years.shape[1]):
-    minwhere[i] = np.where(years[:,i] == minyr[i])[0]
+minyr,minwhere = CR.calcAnnualExtremes(years,'min')
 
 plt.scatter(minwhere[:-1],minyr[:-1],c=minyr[:-1],s=50,
             cmap='plasma_r',zorder=10)
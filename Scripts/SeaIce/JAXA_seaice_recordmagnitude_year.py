@@ -9,11 +9,11 @@ Date      : 18 October 2016
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib
 import datetime
-import urllib.request
-import urllib as UL
+import calc_SeaIceRecords as CR
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -23,15 +23,8 @@ currentdy = str(now.day-1)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -56,12 +49,11 @@ currentanom = currentice - (mean1980[lastday]/1e6)
 currentyear[10] = currentyear[9]
 
 ### Calculate magnitude of record
-years2 = years[:,:-1]
-mins = np.nanmin(years2[:,:],axis=1)
+record,previous,holder,margin,count = CR.calcRunningRecords(years,'low')
 
 ### Select month
 octs = np.where(month == 10)[0]
-recdiff = currentyear - mins
+recdiff = margin[:,-1]
 
 ###############################################################################
 ###############################################################################
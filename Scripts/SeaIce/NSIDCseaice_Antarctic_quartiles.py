@@ -8,8 +8,9 @@ Date      : 5 September 2016
 
 ### Import modules
 import numpy as np
-import urllib.request
-import urllib as UL
+import read_SeaIceExtent_NSIDC as RN
+import calc_DailyMatrix as DM
+import calc_SeaIceClimatology as CL
 import datetime
 import matplotlib.pyplot as plt
 
@@ -22,19 +23,10 @@ currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 currentdoy = now.timetuple().tm_yday
 
-### Load url
-url = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/south/daily/data/' \
-        'S_seaice_extent_daily_v3.0.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4])
+### Read file (cached, missing data as nan)
+dataset = RN.readNSIDCDaily('south')
                         
-print('\nCompleted: Read sea ice data!')                        
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+print('\nCompleted: Read sea ice data!')
 
 ### Variables
 year = dataset[:,0]
@@ -64,15 +56,12 @@ print('7-day change SIE = %s km^2 \n' % (iceval[-1]-iceval[-8]))
 ###########################################################################
 ###########################################################################
 ###########################################################################
-### Reads in 1981-2010 means
-### Load url
-url2 = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/south/daily/data/' \
-       'S_seaice_extent_climatology_1981-2010_v3.0.csv'
-
-### Read file
-raw_data2 = UL.request.urlopen(url2)
-dataset2 = np.genfromtxt(raw_data2, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4,5,6,7])
+### Daily climatology for any baseline (from the daily data, cached)
+baseline = [1981,2010]
+doyall = DM.calcDayOfYear(year,month,day)
+iceall,yearsall = DM.calcYearDayMatrix(ice,year,doyall,'keep')
+dataset2 = CL.calcDailyClimatology(iceall,yearsall,baseline,
+                                   [10,25,50,75,90],1,'./Data/NSIDC/')
                         
 ### Create variables
 doy = dataset2[:,0]
@@ -167,7 +156,7 @@ plt.plot(doy,quartile90,color='m',alpha=0.7,zorder=3,linewidth=0.01)
 ax.fill_between(doy, lower2std, upper2std, facecolor='white', alpha=0.35,
                 label=r'$\pm$2 standard deviations',zorder=2)
 plt.plot(doy,quartile50,color='gold',alpha=1,zorder=3,linewidth=1.5,
-         label=r'Median (1981-2010)')    
+         label=r'Median (%s-%s)' % tuple(baseline))    
             
 ax.fill_between(doy, quartile90, quartile75, facecolor='m', alpha=0.55,
                 label=r'10-90th percentiles',zorder=2)
@@ -9,8 +9,7 @@ Date      : 5 September 2016
 
 ### Import modules
 import numpy as np
-import urllib.request
-import urllib as UL
+import read_SeaIceExtent_NSIDC as RN
 import datetime
 import matplotlib.pyplot as plt
 
@@ -23,19 +22,10 @@ currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 currentdoy = now.timetuple().tm_yday
 
-### Load url
-url = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/north/daily/data/' \
-    'N_seaice_extent_daily_v3.0.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4])
+### Read file (cached, missing data as nan)
+dataset = RN.readNSIDCDaily('north')
                         
-print('\nCompleted: Read sea ice data!')                        
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+print('\nCompleted: Read sea ice data!')
 
 ### Variables
 year = dataset[:,0]
@@ -65,14 +55,8 @@ print('7-day change SIE = %s km^2 \n' % (iceval[-1]-iceval[-8]))
 ###########################################################################
 ###########################################################################
 ### Reads in 1981-2010 means
-### Load url
-url2 = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/north/daily/data/' \
-       'N_seaice_extent_climatology_1981-2010_v3.0.csv'
-
-### Read file
-raw_data2 = UL.request.urlopen(url2)
-dataset2 = np.genfromtxt(raw_data2, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4,5,6,7])
+### Read file (cached)
+dataset2 = RN.readNSIDCClimatology('north')
                         
 ### Create variables
 doy = dataset2[:,0]
@@ -8,8 +8,9 @@ Date      : 22 January 2018
 
 ### Import modules
 import numpy as np
-import urllib.request
-import urllib as UL
+import read_SeaIceExtent_NSIDC as RN
+import calc_DailyMatrix as DM
+import calc_SeaIceClimatology as CL
 import datetime
 import matplotlib.pyplot as plt
 
@@ -23,19 +24,10 @@ currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 currentdoy = now.timetuple().tm_yday
 
-### Load url
-url = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/north/daily/data/' \
-    'N_seaice_extent_daily_v3.0.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4])
+### Read file (cached, missing data as nan)
+dataset = RN.readNSIDCDaily('north')
                         
-print('\nCompleted: Read sea ice data!')                    
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+print('\nCompleted: Read sea ice data!')
 
 ### Variables
 year = dataset[:,0]
@@ -55,22 +47,16 @@ iceval = ice18 * 1e6
 ###########################################################################
 ###########################################################################
 ### Reads in 1981-2010 means
-### Load url
-url2 = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/north/daily/data/' \
-       'N_seaice_extent_climatology_1981-2010_v3.0.csv'
-
-### Read file
-raw_data2 = UL.request.urlopen(url2)
-dataset2 = np.genfromtxt(raw_data2, skip_header=2,delimiter=',',
-                        usecols=[0,1,2,3,4,5,6,7])
+### Read file (cached)
+dataset2 = RN.readNSIDCClimatology('north')
                         
 ### Create variables
 doy = dataset2[:,0]
 meanice = dataset2[:,1] * 1e6
 std = dataset2[:,2]
 
-upper2std = (meanice[:365]/1e6)+(std[:365]*2)
-lower2std = (meanice[:365]/1e6)-(std[:365]*2)
+### Thresholds of -1 and -2 sigma (365 days)
+thresholds = CL.calcSigmaThresholds(meanice[:365]/1e6,std[:365],[-1,-2])
 
 ### Quartiles
 quartile10 = dataset2[:,3]
@@ -85,29 +71,14 @@ currentanom = iceval[-1]-meanice[currentdoy-2]
 ### Printing
 print('Current anomaly = %s km^2 \n' % currentanom)
 
-### Selecting years
-yearsq = np.arange(1990,2018,1)
-iceall = np.empty((28,365))
-for i in range(yearsq.shape[0]):
-    yrice = np.where(year == yearsq[i])[0]
-    iceall[i,:] = ice[yrice][:365]
-    
-### Years below 2 sigma
-minus = iceall - lower2std
-minus[np.where(minus>=0)]=np.nan
-minus[np.where(minus<0)]=1
-
-minus18 = ice18 - lower2std[:len(ice18)]
-minus18[np.where(minus18>=0)]=np.nan
-minus18[np.where(minus18<0)]=1
-minus18yr = np.count_nonzero(minus18 == 1)
-
-minusall = []
-for i in range(iceall.shape[0]):
-    minusallq = np.count_nonzero(minus[i] == 1)
-    minusall.append(minusallq)
-    
-minusallnew = minusall + [minus18yr]
+### Selecting years ([year,day], 31 December of leap years left out)
+yearsq = np.arange(1990,2019,1)
+doyall = DM.calcDayOfYear(year,month,day)
+iceall,yearsq = DM.calcYearDayMatrix(ice,year,doyall,'truncate',yearsq)
+
+### Days below -1 and -2 sigma for every year (2018 is the last year)
+daysbelow = CL.calcExceedanceDays(iceall,thresholds,'below')
+minusallnew = daysbelow[1]
 
 ###########################################################################
 ###########################################################################
@@ -9,12 +9,12 @@ Date      : 18 October 2016
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib.colors as c
 import matplotlib
 import datetime
-import urllib.request
-import urllib as UL
+import calc_SeaIceRecords as CR
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -25,15 +25,8 @@ currentdy = str(now.day)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -61,14 +54,10 @@ weekchange = currentice - currentyear[lastday-7]
 daychange = currentice - currentyear[lastday-1]
 
 ### Calculate record low SIE
-recordlow = np.empty((years.shape[0]))
-for i in range(years.shape[0]):
-    if years[i,-1] == np.nanmin(years[i,:]):
-        recordlow[i] = 1.
-    else: 
-        recordlow[i] = 0.
-
-numberlow = np.count_nonzero(recordlow == 1.)
+record,previous,holder,margin,count = CR.calcRunningRecords(years,'low')
+recordlow = record[:,-1].astype(float)
+
+numberlow = count[-1,-1]
 percentlow = float(numberlow)/(lastday) * 100.
 
 print('\n')
@@ -9,12 +9,12 @@ Date      : 23 March 2018
 
 ### Import modules
 import numpy as np
+import read_SeaIceExtent_JAXA as RJ
 import matplotlib.pyplot as plt
 import matplotlib.colors as c
-import urllib.request
-import urllib as UL
 import datetime
 import cmocean
+import calc_SeaIceRecords as CR
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -25,15 +25,8 @@ currentdy = str(now.day)
 currentyr = str(now.year)
 currenttime = currentmn + '_' + currentdy + '_' + currentyr
 
-### Load url
-url = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
-
-### Read file
-raw_data = UL.request.urlopen(url)
-dataset = np.genfromtxt(raw_data, skip_header=0,delimiter=",",)
-
-### Set missing data to nan
-dataset[np.where(dataset==-9999)] = np.nan
+### Read file (cached download, missing data as nan)
+dataset = RJ.readJAXAExtent()
 
 ### Variables
 month     = dataset[1:,0]        # 1-12, nan as month[0]
@@ -58,15 +51,11 @@ currentanom = currentice - (mean1980[lastday]/1e6)
 yearq = np.arange(2002,2018+1,1)
 yearqq = np.arange(2007,2018+1,1)
 
-### Calculate record low SIE
+### Calculate record low SIE (2007-2018)
+record,previous,holder,margin,count = CR.calcRunningRecords(years,'low')
 recordlow = np.empty((12,years.shape[0]))
 recordlow.fill(np.nan)
-for j in range(12):
-    for i in range(365):
-        if years[i,5+j] == np.nanmin(years[i,:6+j]):
-            recordlow[j,i] = 1.
-        else: 
-            recordlow[j,i] = 0.
+recordlow[:,:365] = record[:365,5:5+12].T
             
 recordlowq = np.cumsum(recordlow,axis=1)
 
@@ -0,0 +1,176 @@
+"""
+Functions turn a daily series (e.g., NSIDC extent or PIOMAS volume) into a
+dense [year,day] matrix in one vectorized step. Days are placed in columns
+by an explicit leap day policy, and gaps, missing years and the rest of the
+current year are nan. The day to column lookup is cached for each span of
+years and policy.
+
+Notes
+-----
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] calcDayOfYear(year,month,day)
+    [2] dayColumns(firstyear,nyears,leap)
+    [3] calcYearDayMatrix(var,year,doy,leap,years)
+"""
+
+import functools
+import numpy as np
+from calc_Logging import logFunction
+
+### Leap day policies (number of columns)
+###   'keep'     : column is day of year - 1, day 366 is nan in other years
+###                (same days as the NSIDC climatology) [366]
+###   'truncate' : as 'keep' but 31 December of leap years is left out
+###                (former [:365] of each year, PIOMAS daily files) [365]
+###   'drop'     : 29 February is left out, so each date is in the same
+###                column every year [365]
+###   'fill'     : 29 February is nan in other years, so each date is in
+###                the same column every year [366]
+LEAPDAYS = {'keep' : 366,'truncate' : 365,'drop' : 365,'fill' : 366}
+
+### Days before each month (normal and leap years)
+MONTHDAYS = np.cumsum([[0,31,28,31,30,31,30,31,31,30,31,30,31],
+                       [0,31,29,31,30,31,30,31,31,30,31,30,31]],axis=1)
+
+def isLeap(year):
+    """
+    Returns True for leap years (Gregorian calendar)
+    """
+    year = np.asarray(year,dtype=int)
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+def calcDayOfYear(year,month,day):
+    """
+    Function calculates the day of year (1-366) of dates given as arrays of
+    year, month and day (e.g., columns of the NSIDC daily file)
+
+    Parameters
+    ----------
+    year : 1d array
+        year of each date
+    month : 1d array
+        month of each date (1-12)
+    day : 1d array
+        day of month of each date
+
+    Returns
+    -------
+    doy : 1d integer array
+        day of year (1 for 1 January)
+
+    Usage
+    -----
+    doy = calcDayOfYear(year,month,day)
+    """
+
+    leap = isLeap(year).astype(int)
+    month = np.asarray(month,dtype=int)
+    return MONTHDAYS[leap,month-1] + np.asarray(day,dtype=int)
+
+@functools.lru_cache(maxsize=32)
+def dayColumns(firstyear,nyears,leap='keep'):
+    """
+    Function returns the column of every day of year for a span of years
+    with a leap day policy (cached, so it is only built once per span)
+
+    Parameters
+    ----------
+    firstyear : integer
+        first year (row 0)
+    nyears : integer
+        number of years (rows)
+    leap : string, optional
+        leap day policy ('keep','truncate','drop' or 'fill')
+
+    Returns
+    -------
+    columns : 2d integer array [year,367]
+        column of each day of year (index 1-366), -1 for days left out or
+        not in the year
+
+    Usage
+    -----
+    columns = dayColumns(firstyear,nyears,leap)
+    """
+
+    if leap not in LEAPDAYS:
+        raise ValueError('Wrong leap day policy (keep, truncate, drop ' \
+                         'or fill)!')
+
+    leapyear = isLeap(np.arange(firstyear,firstyear + nyears))[:,np.newaxis]
+    doy = np.arange(367)[np.newaxis,:]
+    length = np.where(leapyear,366,365)
+
+    ### Day of year to column for normal and leap years
+    if leap in ('keep','truncate'):
+        columns = np.repeat(doy - 1,nyears,axis=0)
+    elif leap == 'drop':
+        columns = np.where(leapyear & (doy >= 60),doy - 2,doy - 1)
+        columns = np.where(leapyear & (doy == 60),-1,columns)
+    else:
+        columns = np.where(~leapyear & (doy >= 60),doy,doy - 1)
+
+    columns = np.where((doy < 1) | (doy > length) | \
+                       (columns >= LEAPDAYS[leap]),-1,columns)
+    columns.setflags(write=False)
+    return columns
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def calcYearDayMatrix(var,year,doy,leap='keep',years=None):
+    """
+    Function places a daily series into a dense [year,day] matrix. Missing
+    days, years without data and days after the end of the series are nan
+    (a later duplicate of a date replaces an earlier one)
+
+    Parameters
+    ----------
+    var : 1d array [day]
+        daily values
+    year : 1d array [day]
+        year of each value
+    doy : 1d array [day]
+        day of year of each value (1-366, see calcDayOfYear)
+    leap : string, optional
+        leap day policy ('keep','truncate','drop' or 'fill', see LEAPDAYS)
+    years : 1d array, optional
+        consecutive years of the rows (default first to last year of data)
+
+    Returns
+    -------
+    matrix : 2d array [year,day]
+        daily values with one row per year
+    years : 1d array [year]
+        year of each row
+
+    Usage
+    -----
+    matrix,years = calcYearDayMatrix(var,year,doy,leap,years)
+    """
+
+    var = np.asarray(var,dtype=float)
+    year = np.asarray(year,dtype=int)
+    doy = np.asarray(doy,dtype=int)
+    if years is None:
+        years = np.arange(year.min(),year.max() + 1)
+    years = np.asarray(years,dtype=int)
+
+    ### Row and column of each value (dates outside of years are left out)
+    columns = dayColumns(int(years[0]),len(years),leap)
+    row = year - years[0]
+    valid = (row >= 0) & (row < len(years)) & (doy >= 1) & (doy <= 366)
+    column = np.full(var.shape,-1)
+    column[valid] = columns[row[valid],doy[valid]]
+    valid = column >= 0
+
+    matrix = np.full((len(years),LEAPDAYS[leap]),np.nan)
+    matrix[row[valid],column[valid]] = var[valid]
+
+    return matrix,years
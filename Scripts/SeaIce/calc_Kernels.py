@@ -0,0 +1,225 @@
+"""
+Compiled kernels for nan-aware weighted sums and per-gridpoint moments.
+Masking, weighting and accumulation are done in one pass without temporary
+arrays when numba is installed, otherwise the same results are calculated
+with numpy. Running this file checks the compiled kernels against numpy.
+
+Notes
+-----
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] weightedSums(var,weights)
+    [2] nanMoments(var)
+    [3] checkKernels()
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def weightedSumsNumpy(var,weights):
+    """
+    Numpy version of weightedSums for [n,points] and [points] arrays
+    """
+
+    finite = np.isfinite(var)
+    valid = finite & np.isfinite(weights)
+    gw = np.where(valid,weights,0)
+    total = np.sum(np.where(valid,var,0)*gw,axis=-1,dtype='float64')
+    wsum = np.sum(gw,axis=-1,dtype='float64')
+    return total,wsum,np.sum(finite,axis=-1)
+
+def nanMomentsNumpy(var):
+    """
+    Numpy version of nanMoments for [sample,points] arrays
+    """
+
+    finite = np.isfinite(var)
+    n = np.sum(finite,axis=0).astype(float)
+    var = np.where(finite,var,0.)
+    with np.errstate(invalid='ignore',divide='ignore'):
+        mean = np.sum(var,axis=0)/n
+        anom = np.where(finite,var - mean,0.)
+    return n,mean,np.sum(anom**2,axis=0)
+
+if numba is not None:
+    @numba.njit(parallel=True,cache=True,error_model='numpy')
+    def weightedSumsNumba(var,weights):
+        total = np.zeros(var.shape[0])
+        wsum = np.zeros(var.shape[0])
+        count = np.zeros(var.shape[0],dtype=np.int64)
+        for i in numba.prange(var.shape[0]):
+            vsum = 0.
+            gsum = 0.
+            nsum = 0
+            for j in range(var.shape[1]):
+                if np.isfinite(var[i,j]):
+                    nsum += 1
+                    if np.isfinite(weights[j]):
+                        vsum += var[i,j]*weights[j]
+                        gsum += weights[j]
+            total[i] = vsum
+            wsum[i] = gsum
+            count[i] = nsum
+        return total,wsum,count
+
+    @numba.njit(parallel=True,cache=True,error_model='numpy')
+    def nanMomentsNumba(var):
+        n = np.zeros(var.shape[1])
+        mean = np.zeros(var.shape[1])
+        ss = np.zeros(var.shape[1])
+        for j in numba.prange(var.shape[1]):
+            nsum = 0.
+            vsum = 0.
+            for i in range(var.shape[0]):
+                if np.isfinite(var[i,j]):
+                    nsum += 1.
+                    vsum += var[i,j]
+            n[j] = nsum
+            mean[j] = vsum/nsum
+            if nsum > 0:
+                for i in range(var.shape[0]):
+                    if np.isfinite(var[i,j]):
+                        ss[j] += (var[i,j] - mean[j])**2
+        return n,mean,ss
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+def weightedSums(var,weights,compiled=True):
+    """
+    Function sums var x weights, the weights and the number of finite values
+    over the last two dimensions [lat,lon] in one pass. Missing values (var
+    or weights) are left out of both sums
+
+    Parameters
+    ----------
+    var : nd array [...,lat,lon]
+        gridded variable
+    weights : 2d array [lat,lon]
+        cos(lat) weights or grid cell area
+    compiled : boolean, optional
+        use the numba kernel if numba is installed
+
+    Returns
+    -------
+    total : nd array [...]
+        sum of var x weights (float64)
+    wsum : nd array [...]
+        sum of weights where var is finite (float64)
+    count : nd array [...]
+        number of finite values of var
+
+    Usage
+    -----
+    total,wsum,count = weightedSums(var,weights,compiled)
+    """
+
+    var = np.asarray(var)
+    weights = np.broadcast_to(weights,var.shape[-2:])
+    shape = var.shape[:-2]
+    var = np.reshape(var,(-1,weights.size))
+    weights = np.reshape(weights,(weights.size))
+
+    if compiled and numba is not None and var.dtype.kind == 'f':
+        total,wsum,count = weightedSumsNumba(var,
+                                             weights.astype('float64'))
+    else:
+        total,wsum,count = weightedSumsNumpy(var,weights)
+
+    return (np.reshape(total,shape),np.reshape(wsum,shape),
+            np.reshape(count,shape))
+
+def nanMoments(var,compiled=True):
+    """
+    Function calculates the number of finite samples, mean and sum of
+    squared anomalies at every point of a [sample,point] array
+
+    Parameters
+    ----------
+    var : 2d array [sample,point]
+        samples at each gridpoint
+    compiled : boolean, optional
+        use the numba kernel if numba is installed
+
+    Returns
+    -------
+    n : 1d array [point]
+        number of finite samples (float)
+    mean : 1d array [point]
+        mean of finite samples (nan if there are none)
+    ss : 1d array [point]
+        sum of squared anomalies of finite samples
+
+    Usage
+    -----
+    n,mean,ss = nanMoments(var,compiled)
+    """
+
+    var = np.asarray(var,dtype=float)
+    if compiled and numba is not None:
+        return nanMomentsNumba(var)
+    return nanMomentsNumpy(var)
+
+def checkKernels():
+    """
+    Function compares the compiled kernels with numpy for random data with
+    missing values (float32 and float64) and returns the largest relative
+    difference of each output
+
+    Usage
+    -----
+    diffs = checkKernels()
+    """
+
+    if numba is None:
+        print('numba is not installed (numpy versions are used)!')
+        return {}
+
+    def reldiff(compiled,numpy):
+        compiled = np.asarray(compiled,dtype='float64')
+        numpy = np.asarray(numpy,dtype='float64')
+        if not np.array_equal(np.isnan(compiled),np.isnan(numpy)):
+            return np.inf
+        finite = np.isfinite(numpy)
+        scale = np.maximum(np.abs(numpy[finite]),1.)
+        return np.max(np.abs(compiled[finite] - numpy[finite])/scale,
+                      initial=0.)
+
+    random = np.random.RandomState(0)
+    diffs = {}
+    for dtype in ['float32','float64']:
+        var = random.randn(5,12,30,40).astype(dtype)
+        var[random.rand(*var.shape) < 0.2] = np.nan
+        var[0,0] = np.nan
+        weights = random.rand(30,40)
+        weights[:5] = np.nan
+        for name,compiled,numpy in zip(['total','wsum','count'],
+                                       weightedSums(var,weights),
+                                       weightedSums(var,weights,False)):
+            diffs['weightedSums %s %s' % (name,dtype)] = \
+                reldiff(compiled,numpy)
+
+        samples = np.reshape(var[:,:2],(10,-1))
+        for name,compiled,numpy in zip(['n','mean','ss'],
+                                       nanMoments(samples),
+                                       nanMoments(samples,False)):
+            diffs['nanMoments %s %s' % (name,dtype)] = \
+                reldiff(compiled,numpy)
+
+    for name in sorted(diffs):
+        print('%s ---> %.2e' % (name,diffs[name]))
+    if max(diffs.values()) > 1e-10:
+        raise ValueError('Compiled kernels do not match numpy!')
+    print('*Completed: Kernels match numpy!')
+    return diffs
+
+if __name__ == '__main__':
+    checkKernels()
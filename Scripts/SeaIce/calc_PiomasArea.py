@@ -1,5 +1,7 @@
 """
-Script calculates area of PIOMAS grid. 
+Script calculates area of PIOMAS grid. Grid text files are parsed once and
+stored as a binary cache next to the source file, which is rebuilt when the
+text file changes (mtime or size).
  
 Notes
 -----
@@ -9,58 +11,160 @@ Notes
     
 Usage
 -----
-    area = readPiomasArea(directory)
+    area = readPiomasArea(directory,dtype)
+    grid = readGridCache(filename)
+    piomasgrid = PiomasGrid(directory)
 """
 
-def readPiomasArea(directory):
+import numpy as np
+from calc_Logging import LOGGER, logFunction, addBytesRead
+
+def readGridCache(filename):
     """
-    Function calculates area of PIOMAS grid cells 
+    Function reads a whitespace-delimited grid file into a 1d array using
+    a binary cache ([filename].npz) that is invalidated on mtime/size change
 
     Parameters
     ----------
-    directory : string
-        working directory for stored PIOMAS files
+    filename : string
+        path to grid text file (grid.txt or griddata.txt)
 
     Returns
     -------
-    area : 2d array [lat,lon]
-        area of grid cell
+    grid : 1d array
+        all values in the text file
 
     Usage
     -----
-    area = readPiomasArea(directory)
+    grid = readGridCache(filename)
     """
     
-    print('\n>>> Using readPiomasArea function!')
-    
     ### Import modules
-    import numpy as np
+    import os
+    
+    stat = os.stat(filename)
+    cachefile = filename + '.npz'
+    
+    ### Use binary cache if it matches the text file
+    if os.path.exists(cachefile):
+        try:
+            with np.load(cachefile) as cache:
+                if cache['mtime'] == stat.st_mtime and \
+                    cache['size'] == stat.st_size:
+                    grid = cache['grid']
+                    addBytesRead(grid.nbytes)
+                    return grid
+        except (IOError,OSError,ValueError,KeyError):
+            LOGGER.warning('Rebuilding unreadable cache "%s"' % cachefile)
+    
+    ### Parse text and write cache (atomic rename)
+    grid = np.genfromtxt(filename)
+    addBytesRead(stat.st_size)
+    grid = np.reshape(grid,(grid.size))
+    try:
+        tempfile = cachefile + '.%s.tmp' % os.getpid()
+        with open(tempfile,'wb') as f:
+            np.savez(f,grid=grid,mtime=stat.st_mtime,size=stat.st_size)
+        os.replace(tempfile,cachefile)
+    except (IOError,OSError):
+        LOGGER.warning('Could not write grid cache "%s"' % cachefile)
+    
+    return grid
+
+###############################################################################
+###############################################################################
+###############################################################################
 
-    ### Read in grids
-    grid = np.genfromtxt(directory + 'griddata.txt')
-    grid = np.reshape(grid,(grid.size))  
+class PiomasGrid(object):
+    """
+    PIOMAS GOCC grid read from grid.txt (lats/lons) and griddata.txt (cell
+    edges and area). Each file is only parsed on first use.
+
+    Usage
+    -----
+    piomasgrid = PiomasGrid(directory)
+    area = piomasgrid.area
+    """
+    
+    def __init__(self,directory):
+        self.directory = directory
+        self.fields = {}
+        
+    def gridtxt(self):
+        if 'lats' not in self.fields:
+            grid = readGridCache(self.directory + 'grid.txt')
+            
+            ### Define Lat/Lon
+            self.fields['lons'] = np.reshape(grid[:grid.size//2],(120,360))
+            self.fields['lats'] = np.reshape(grid[grid.size//2:],(120,360))
+        return self.fields
+        
+    def griddatatxt(self):
+        if 'area' not in self.fields:
+            grid = readGridCache(self.directory + 'griddata.txt')
+            
+            ### Define edges (sea PIOMAS grid documentation, fortran)
+            names = ['htn','hte','hts','htw']
+            for i in range(len(names)):
+                block = grid[43200*(i+2):43200*(i+3)]
+                self.fields[names[i]] = np.reshape(block,(120,360))
+            self.fields['area'] = self.fields['htn']*self.fields['hte']
+        return self.fields
+    
+    @property
+    def lats(self):
+        return self.gridtxt()['lats']
+    
+    @property
+    def lons(self):
+        return self.gridtxt()['lons']
     
-    ### Define Lat/Lon (sea PIOMAS grid documentation, fortran)
-    lon = grid[:43200]   
-    lons = np.reshape(lon,(120,360))
-    lat = grid[43200:43200*2]
-    lats = np.reshape(lat,(120,360))
+    @property
+    def htn(self):
+        return self.griddatatxt()['htn']
     
-    htn = grid[43200*2:43200*3]
-    htn = np.reshape(htn,(120,360))
-    hte = grid[43200*3:43200*4]
-    hte = np.reshape(hte,(120,360))
+    @property
+    def hte(self):
+        return self.griddatatxt()['hte']
     
-    hts = grid[43200*4:43200*5]
-    hts = np.reshape(hts,(120,360))
-    htw = grid[43200*5:43200*6]
-    htw = np.reshape(htw,(120,360))
+    @property
+    def hts(self):
+        return self.griddatatxt()['hts']
     
-    ex = grid[43200*6:43200*7]
-    ex = np.reshape(ex,(120,360))
+    @property
+    def htw(self):
+        return self.griddatatxt()['htw']
+    
+    @property
+    def area(self):
+        return self.griddatatxt()['area']
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def readPiomasArea(directory,dtype='float64'):
+    """
+    Function calculates area of PIOMAS grid cells 
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    dtype : string, optional
+        output dtype (e.g., 'float32' to match float32 PIOMAS data)
+
+    Returns
+    -------
+    area : 2d array [lat,lon]
+        area of grid cell
+
+    Usage
+    -----
+    area = readPiomasArea(directory,dtype)
+    """
     
-    print('Calculating area of grid cell')
-    area = htn*hte
+    area = PiomasGrid(directory).area.astype(dtype)
     
-    print('*Completed: Area of PIOMAS calculated!')
     return area
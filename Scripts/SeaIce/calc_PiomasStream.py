@@ -0,0 +1,156 @@
+"""
+Functions reduce a stream of PIOMAS years (see streamPiomas in 
+read_SeaIceThick_PIOMAS.py) into [year,month] time series. Only one year of
+gridded data is held in memory at a time.
+ 
+Notes
+-----
+    Source : http://psc.apl.washington.edu/zhang/IDAO/data_piomas.html
+    Author : Zachary Labe
+    Date   : 18 October 2026
+    
+Usage
+-----
+    [1] weightedAveReducer(area,vari)
+    [2] volumeReducer(area,vari)
+    [3] countReducer(threshold,vari,area)
+    [4] reduceStream(stream,reducers)
+"""
+
+import numpy as np
+import calc_Kernels as CK
+from calc_Logging import logFunction
+
+def weightedAveReducer(area,vari='thick'):
+    """
+    Area-weighted mean of a variable for each month of a block
+
+    Parameters
+    ----------
+    area : 2d array [lat,lon]
+        area of grid cell
+    vari : string, optional
+        variable in the stream ('thick','sic','snow','oflux')
+
+    Returns
+    -------
+    reducer : function
+        maps {vari : [month,lat,lon]} to 1d array [month]
+
+    Usage
+    -----
+    reducer = weightedAveReducer(area,vari)
+    """
+    
+    def reducer(var):
+        total,wsum,count = CK.weightedSums(var[vari],area)
+        with np.errstate(invalid='ignore',divide='ignore'):
+            return total/wsum
+    return reducer
+
+def volumeReducer(area,vari='thick'):
+    """
+    Total sea ice volume (10^3 km^3) for each month of a block. PIOMAS heff
+    is the effective (grid cell mean) thickness in m and the grid edges are
+    in km, so volume is heff x area
+
+    Parameters
+    ----------
+    area : 2d array [lat,lon]
+        area of grid cell (km^2)
+    vari : string, optional
+        thickness variable in the stream
+
+    Returns
+    -------
+    reducer : function
+        maps {vari : [month,lat,lon]} to 1d array [month]
+
+    Usage
+    -----
+    reducer = volumeReducer(area,vari)
+    """
+    
+    def reducer(var):
+        volume,wsum,count = CK.weightedSums(var[vari],area)
+        volume[np.where(count == 0)] = np.nan
+        return volume/1e6
+    return reducer
+
+def countReducer(threshold,vari='thick',area=None):
+    """
+    Number of grid cells (or total area) >= threshold for each month of a
+    block
+
+    Parameters
+    ----------
+    threshold : float
+        count values >= to this value
+    vari : string, optional
+        variable in the stream ('thick','sic','snow','oflux')
+    area : 2d array [lat,lon], optional
+        area of grid cell to sum area instead of counting cells
+
+    Returns
+    -------
+    reducer : function
+        maps {vari : [month,lat,lon]} to 1d array [month]
+
+    Usage
+    -----
+    reducer = countReducer(threshold,vari,area)
+    """
+    
+    def reducer(var):
+        with np.errstate(invalid='ignore'):
+            exceed = var[vari] >= threshold
+        if area is None:
+            count = np.sum(exceed,axis=(1,2)).astype(float)
+        else:
+            count = np.sum(np.where(exceed,area,0.),axis=(1,2),
+                           dtype='float64')
+        count[np.isnan(var[vari]).all(axis=(1,2))] = np.nan
+        return count
+    return reducer
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def reduceStream(stream,reducers):
+    """
+    Function applies several reducers to a stream of PIOMAS years in a single
+    pass
+
+    Parameters
+    ----------
+    stream : generator
+        yields (year,{vari : [month,lat,lon]}) e.g., from streamPiomas
+    reducers : dictionary of functions
+        named reducers (weightedAveReducer, volumeReducer, countReducer)
+
+    Returns
+    -------
+    years : 1d array
+        years in the stream
+    reduced : dictionary of 2d arrays [year,month]
+        keyed by reducer name
+
+    Usage
+    -----
+    years,reduced = reduceStream(stream,reducers)
+    """
+    
+    years = []
+    reduced = {}
+    for name in reducers:
+        reduced[name] = []
+    for year,var in stream:
+        years.append(year)
+        for name in reducers:
+            reduced[name].append(reducers[name](var))
+    
+    for name in reducers:
+        reduced[name] = np.asarray(reduced[name]).reshape(len(years),-1)
+    return np.asarray(years),reduced
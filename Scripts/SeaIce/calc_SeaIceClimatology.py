@@ -0,0 +1,229 @@
+"""
+Functions calculate a daily climatology (mean, standard deviation and any
+percentiles) for any baseline from a [year,day] matrix of daily sea ice
+extent (see calc_DailyMatrix.py), and compare the matrix with daily
+thresholds, such as -1/-2 standard deviations from the mean or the
+10th/90th percentiles, counting the days below or above each threshold for
+every year in one broadcasted step.
+
+Notes
+-----
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] calcDailyClimatology(matrix,years,baseline,percentiles,window,
+                             cachedirectory)
+    [2] calcSigmaThresholds(mean,std,sigmas)
+    [3] calcExceedanceDays(matrix,thresholds,kind)
+"""
+
+import numpy as np
+from calc_Logging import LOGGER, logFunction
+
+### Climatologies calculated in this session [calcDailyClimatology]
+CLIMATOLOGIES = {}
+
+def nanPercentiles(samples,percentiles):
+    """
+    Percentiles (linear interpolation) of the finite samples of each column
+    of a [sample,day] array, using np.partition once for each number of
+    finite samples instead of sorting
+    """
+
+    percentiles = np.asarray(percentiles,dtype=float)
+    finite = np.isfinite(samples)
+    count = np.sum(finite,axis=0)
+    samples = np.where(finite,samples,np.inf)
+    result = np.full((len(percentiles),samples.shape[1]),np.nan)
+
+    for n in np.unique(count[count > 0]):
+        columns = np.where(count == n)[0]
+        position = percentiles/100.*(n - 1)
+        lower = np.floor(position).astype(int)
+        upper = np.ceil(position).astype(int)
+        part = np.partition(samples[:,columns],np.unique(np.append(lower,
+                                                                   upper)),
+                            axis=0)
+        weight = (position - lower)[:,np.newaxis]
+        result[:,columns] = part[lower]*(1 - weight) + part[upper]*weight
+
+    return result
+
+@logFunction
+def calcDailyClimatology(matrix,years,baseline=(1981,2010),
+                         percentiles=(10,25,50,75,90),window=1,
+                         cachedirectory=None):
+    """
+    Function calculates the daily mean, standard deviation and percentiles
+    of the years of a baseline (e.g., 1981-2010 or 1991-2020) from a
+    [year,day] matrix, optionally from all days of a centered n-day window
+    (days of year wrap around). Missing days are left out. Results are
+    kept for the session and, if cachedirectory is given, as [.npz] files
+    keyed by the baseline, window, percentiles and data of the baseline
+
+    Parameters
+    ----------
+    matrix : 2d array [year,day]
+        daily values with one row per year (see calcYearDayMatrix)
+    years : 1d array [year]
+        year of each row
+    baseline : list of 2 integers, optional
+        first and last year of the baseline
+    percentiles : list of floats, optional
+        percentiles (0-100)
+    window : integer, optional
+        odd number of days centered on each day (1 for single days)
+    cachedirectory : string, optional
+        directory for cached climatologies
+
+    Returns
+    -------
+    climatology : 2d array [day,3+percentile]
+        day of year, mean, standard deviation and percentiles (same layout
+        as readNSIDCClimatology)
+
+    Usage
+    -----
+    climatology = calcDailyClimatology(matrix,years,baseline,percentiles,
+                                       window,cachedirectory)
+    """
+
+    ### Import modules
+    import os
+    import hashlib
+
+    if window < 1 or window % 2 == 0:
+        raise ValueError('Window must be an odd number of days!')
+    years = np.asarray(years)
+    rows = (years >= baseline[0]) & (years <= baseline[1])
+    if not np.any(rows):
+        raise ValueError('No years of the baseline in the matrix!')
+    base = np.ascontiguousarray(np.asarray(matrix,dtype=float)[rows])
+
+    ### Key of the baseline, settings and data
+    digest = hashlib.sha1(base.tobytes())
+    digest.update(repr((list(baseline),list(percentiles),window)).encode())
+    key = digest.hexdigest()[:20]
+    if key in CLIMATOLOGIES:
+        return CLIMATOLOGIES[key]
+    if cachedirectory is not None:
+        cachefile = cachedirectory + 'climatology_%s.npz' % key
+        if os.path.exists(cachefile):
+            try:
+                with np.load(cachefile) as cache:
+                    CLIMATOLOGIES[key] = cache['climatology']
+                    return CLIMATOLOGIES[key]
+            except (IOError,OSError,ValueError,KeyError):
+                LOGGER.warning('Rebuilding unreadable cache "%s"' \
+                               % cachefile)
+
+    ### Samples of each day [window x year,day]
+    half = window//2
+    samples = np.concatenate([np.roll(base,-shift,axis=1)
+                              for shift in range(-half,half + 1)],axis=0)
+
+    ### Mean and standard deviation of finite samples
+    finite = np.isfinite(samples)
+    count = np.sum(finite,axis=0)
+    with np.errstate(invalid='ignore',divide='ignore'):
+        mean = np.sum(np.where(finite,samples,0.),axis=0)/count
+        anom = np.where(finite,samples - mean,0.)
+        std = np.sqrt(np.sum(anom**2,axis=0)/(count - 1))
+
+    climatology = np.column_stack([np.arange(1,base.shape[1] + 1),mean,std,
+                                   nanPercentiles(samples,percentiles).T])
+    CLIMATOLOGIES[key] = climatology
+
+    if cachedirectory is not None:
+        try:
+            if not os.path.isdir(cachedirectory):
+                os.makedirs(cachedirectory)
+            tempfile = cachefile + '.%s.tmp' % os.getpid()
+            with open(tempfile,'wb') as f:
+                np.savez(f,climatology=climatology)
+            os.replace(tempfile,cachefile)
+        except (IOError,OSError):
+            LOGGER.warning('Could not write climatology cache "%s"' \
+                           % cachefile)
+
+    return climatology
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+def calcSigmaThresholds(mean,std,sigmas):
+    """
+    Function stacks daily thresholds of mean + sigma x standard deviation
+
+    Parameters
+    ----------
+    mean : 1d array [day]
+        daily climatological mean
+    std : 1d array [day]
+        daily climatological standard deviation
+    sigmas : list of floats
+        number of standard deviations (e.g., [-1,-2,1,2])
+
+    Returns
+    -------
+    thresholds : 2d array [sigma,day]
+        daily thresholds
+
+    Usage
+    -----
+    thresholds = calcSigmaThresholds(mean,std,sigmas)
+    """
+
+    sigmas = np.asarray(sigmas,dtype=float)[:,np.newaxis]
+    return np.asarray(mean)[np.newaxis,:] + sigmas*np.asarray(std)
+
+@logFunction
+def calcExceedanceDays(matrix,thresholds,kind='below'):
+    """
+    Function counts the days of each year below (or above) each daily
+    threshold. Missing days and thresholds are never counted, and
+    thresholds with more days than the matrix (e.g., a 366 day
+    climatology) are cut to the days of the matrix
+
+    Parameters
+    ----------
+    matrix : 2d array [year,day]
+        daily values with one row per year (nan after the current day)
+    thresholds : 1d array [day] or 2d array [threshold,day]
+        daily thresholds (e.g., from calcSigmaThresholds or percentiles)
+    kind : string, optional
+        'below' counts values < threshold and 'above' values > threshold
+
+    Returns
+    -------
+    days : 1d integer array [year] or 2d integer array [threshold,year]
+        number of days beyond each threshold for every year
+
+    Usage
+    -----
+    days = calcExceedanceDays(matrix,thresholds,kind)
+    """
+
+    matrix = np.asarray(matrix,dtype=float)
+    thresholds = np.asarray(thresholds,dtype=float)
+    ndays = matrix.shape[-1]
+    if thresholds.shape[-1] < ndays:
+        raise ValueError('Thresholds have fewer days than the matrix!')
+
+    ### Broadcast [threshold,1,day] against [year,day]
+    limits = np.atleast_2d(thresholds[...,:ndays])[:,np.newaxis,:]
+    with np.errstate(invalid='ignore'):
+        if kind == 'below':
+            beyond = matrix < limits
+        elif kind == 'above':
+            beyond = matrix > limits
+        else:
+            raise ValueError('Wrong kind of exceedance (below or above)!')
+    days = np.sum(beyond,axis=-1)
+
+    if thresholds.ndim == 1:
+        return days[0]
+    return days
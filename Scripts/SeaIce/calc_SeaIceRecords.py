@@ -0,0 +1,175 @@
+"""
+Functions track daily records (lowest or highest value to date) through a
+[day,year] matrix of sea ice extent in one pass over the years using a
+running minimum/maximum, and find the annual minimum/maximum (and its day)
+of daily extent or volume.
+
+Notes
+-----
+    Source : https://ads.nipr.ac.jp/vishop/vishop-extent.html
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] calcRunningRecords(years,kind)
+    [2] smoothDaily(var,window,axis)
+    [3] calcAnnualExtremes(var,kind,window,axis)
+"""
+
+import numpy as np
+from calc_Logging import logFunction
+
+@logFunction
+def calcRunningRecords(years,kind='low'):
+    """
+    Function finds, for every day and year, whether a record was set (the
+    value is as low/high as all earlier years, ties included), the previous
+    record, the year holding it and the margin to it. Missing values never
+    set or hold a record
+
+    Parameters
+    ----------
+    years : 2d array [day,year]
+        daily values with one column per year (e.g., JAXA extent)
+    kind : string, optional
+        'low' for record lows or 'high' for record highs
+
+    Returns
+    -------
+    record : 2d boolean array [day,year]
+        True if the value ties or beats every earlier year
+    previous : 2d array [day,year]
+        record from the earlier years (nan for the first year with data)
+    holder : 2d integer array [day,year]
+        column of the year holding the previous record (-1 if none)
+    margin : 2d array [day,year]
+        value - previous record (negative for new record lows)
+    count : 2d integer array [day,year]
+        cumulative number of records set through each day of the year
+
+    Usage
+    -----
+    record,previous,holder,margin,count = calcRunningRecords(years,kind)
+    """
+
+    if kind == 'low':
+        running = np.fmin.accumulate(years,axis=1)
+    elif kind == 'high':
+        running = np.fmax.accumulate(years,axis=1)
+    else:
+        raise ValueError('Wrong kind of record (low or high)!')
+
+    ### Record from the earlier years (running extreme shifted by a year)
+    previous = np.empty(years.shape)
+    previous[:,0] = np.nan
+    previous[:,1:] = running[:,:-1]
+
+    ### Record set if value equals the running extreme through its year
+    with np.errstate(invalid='ignore'):
+        record = np.isfinite(years) & (years == running)
+
+    ### Column of the latest record through each year
+    column = np.where(record,np.arange(years.shape[1]),-1)
+    latest = np.maximum.accumulate(column,axis=1)
+    holder = np.empty(years.shape,dtype=int)
+    holder[:,0] = -1
+    holder[:,1:] = latest[:,:-1]
+
+    margin = years - previous
+    count = np.cumsum(record,axis=0)
+
+    return record,previous,holder,margin,count
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+def smoothDaily(var,window,axis=0):
+    """
+    Function calculates a trailing n-day mean (e.g., the NSIDC 5-day mean)
+    along the day axis. Missing days are left out of each mean and days
+    without a full window are nan
+
+    Parameters
+    ----------
+    var : nd array
+        daily values
+    window : integer
+        number of days in the mean
+    axis : integer, optional
+        axis of days
+
+    Returns
+    -------
+    smooth : nd array
+        trailing n-day mean (same shape as var)
+
+    Usage
+    -----
+    smooth = smoothDaily(var,window,axis)
+    """
+
+    var = np.moveaxis(np.asarray(var,dtype=float),axis,0)
+    finite = np.isfinite(var)
+
+    ### Running sums of values and finite days (window sums by differences)
+    total = np.cumsum(np.where(finite,var,0.),axis=0)
+    count = np.cumsum(finite,axis=0)
+    total[window:] = total[window:] - total[:-window]
+    count[window:] = count[window:] - count[:-window]
+
+    with np.errstate(invalid='ignore',divide='ignore'):
+        smooth = np.where(count > 0,total/count,np.nan)
+    smooth[:window-1] = np.nan
+
+    return np.moveaxis(smooth,0,axis)
+
+@logFunction
+def calcAnnualExtremes(var,kind='min',window=None,axis=0):
+    """
+    Function finds the annual minimum or maximum and the day it occurred
+    for every year of a daily matrix (JAXA/NSIDC [day,year] extent or PIOMAS
+    [year,day] volume). Missing days are ignored, ties are dated by their
+    first day and years without data are nan
+
+    Parameters
+    ----------
+    var : 2d array
+        daily values with one column (or row) per year
+    kind : string, optional
+        'min' or 'max'
+    window : integer, optional
+        find extremes of the trailing n-day mean instead of daily values
+    axis : integer, optional
+        axis of days (0 for [day,year], 1 for [year,day])
+
+    Returns
+    -------
+    extreme : 1d array [year]
+        annual minimum/maximum
+    day : 1d array [year]
+        index of the day of the extreme (nan if the year has no data)
+
+    Usage
+    -----
+    extreme,day = calcAnnualExtremes(var,kind,window,axis)
+    """
+
+    var = np.asarray(var,dtype=float)
+    if window is not None and window > 1:
+        var = smoothDaily(var,window,axis)
+    var = np.moveaxis(var,axis,0)
+
+    ### Nan-safe argmin/argmax (missing days can never be the extreme)
+    if kind == 'min':
+        day = np.argmin(np.where(np.isnan(var),np.inf,var),axis=0)
+    elif kind == 'max':
+        day = np.argmax(np.where(np.isnan(var),-np.inf,var),axis=0)
+    else:
+        raise ValueError('Wrong kind of extreme (min or max)!')
+
+    extreme = var[day,np.arange(var.shape[1])]
+    day = np.where(np.isnan(extreme),np.nan,day)
+
+    return extreme,day
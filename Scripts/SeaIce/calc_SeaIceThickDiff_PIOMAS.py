@@ -0,0 +1,97 @@
+"""
+Functions calculate differences in PIOMAS sea ice thickness between many
+pairs of years (and months) at once from a single [year,month,lat,lon] 
+array.
+ 
+Notes
+-----
+    Source : http://psc.apl.washington.edu/zhang/IDAO/data_piomas.html
+    Author : Zachary Labe
+    Date   : 18 October 2026
+    
+Usage
+-----
+    [1] consecutivePairs(years)
+    [2] baselinePairs(years,baseline)
+    [3] diffThickPairs(sit,years,pairs,months)
+"""
+
+import numpy as np
+from calc_Logging import logFunction
+
+def consecutivePairs(years):
+    """
+    Year pairs for year-over-year differences
+
+    Usage
+    -----
+    pairs = consecutivePairs(years)
+    """
+    return [(years[i-1],years[i]) for i in range(1,len(years))]
+
+def baselinePairs(years,baseline):
+    """
+    Year pairs for differences of every year from a baseline year
+
+    Usage
+    -----
+    pairs = baselinePairs(years,baseline)
+    """
+    return [(baseline,year) for year in years if year != baseline]
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def diffThickPairs(sit,years,pairs,months=None):
+    """
+    Function calculates difference between years for PIOMAS sea ice 
+    thickness (year2 - year1) for every pair and month in one pass. As in 
+    diffThick, missing values count as 0 m and zero differences are nan.
+
+    Parameters
+    ----------
+    sit : 4d array [year,month,lat,lon]
+        sea ice thickness
+    years : 1d array
+        total available years (usually 1979-present)
+    pairs : list of tuples
+        (year1,year2) for each difference
+    months : integer or list of integers, optional
+        months using Python indexing (default all 12)
+
+    Returns
+    -------
+    diffsit : 4d array [pair,month,lat,lon]
+        difference between years of sea ice thickness
+
+    Usage
+    -----
+    diffsit = diffThickPairs(sit,years,pairs,months)
+    """
+    
+    ### Indices of each year of the pairs
+    index = dict((year,i) for i,year in enumerate(years))
+    for pair in pairs:
+        for year in pair:
+            if year not in index:
+                raise ValueError('Year %s is not available!' % year)
+    yr1 = np.array([index[pair[0]] for pair in pairs],dtype=int)
+    yr2 = np.array([index[pair[1]] for pair in pairs],dtype=int)
+    
+    if months is None:
+        months = np.arange(sit.shape[1])
+    months = np.atleast_1d(months)
+    if np.any(months > 11) or np.any(months < 0):
+        raise ValueError('Month is out of range!')
+    
+    ### Gather [pair,month,lat,lon] and difference
+    year1 = sit[np.ix_(yr1,months)]
+    year2 = sit[np.ix_(yr2,months)]
+    year1[np.where(np.isnan(year1))] = 0.0
+    year2[np.where(np.isnan(year2))] = 0.0
+    
+    diffsit = year2 - year1
+    diffsit[np.where(diffsit == 0.0)] = np.nan
+    return diffsit
@@ -0,0 +1,217 @@
+"""
+Functions calculate sea ice volume from gridded PIOMAS thickness (and
+optionally concentration) and the area of each grid cell. Volume can be
+calculated for the whole grid or any number of regional masks and is
+cached next to the PIOMAS files.
+ 
+Notes
+-----
+    Source : http://psc.apl.washington.edu/zhang/IDAO/data_piomas.html
+    Author : Zachary Labe
+    Date   : 18 October 2026
+    
+Usage
+-----
+    [1] calcPiomasVolume(sit,area,sic,regions)
+    [2] readPiomasVolume(directory,years,threshold,regions)
+    [3] validatePiomasVolume(directory,years,volume)
+"""
+
+import numpy as np
+from calc_Logging import LOGGER, logFunction, addBytesRead
+
+@logFunction
+def calcPiomasVolume(sit,area,sic=None,regions=None):
+    """
+    Function calculates sea ice volume (10^3 km^3) for [...,lat,lon] arrays.
+    PIOMAS heff is the effective (grid cell mean) thickness (m), so volume is
+    heff x area. If the thickness is per unit ice area, the concentration
+    (sic) is also multiplied in. Grid cell edges are in km.
+
+    Parameters
+    ----------
+    sit : nd array [...,lat,lon]
+        sea ice thickness (m)
+    area : 2d array [lat,lon]
+        area of grid cell (km^2)
+    sic : nd array [...,lat,lon], optional
+        sea ice concentration (0-1) for thickness per unit ice area
+    regions : dictionary of 2d boolean arrays [lat,lon], optional
+        regional masks (True inside region)
+
+    Returns
+    -------
+    volume : nd array [...] or dictionary of nd arrays
+        total sea ice volume (10^3 km^3), per region if regions is given
+
+    Usage
+    -----
+    volume = calcPiomasVolume(sit,area,sic,regions)
+    """
+    
+    ### Import modules
+    import calc_Kernels as CK
+    
+    ### Ice thickness (m) x grid cell area (km^3/m)
+    thick = sit if sic is None else sit*sic
+    missing = None if sic is None else np.isnan(sit).all(axis=(-2,-1))
+    
+    ### Sum over grid in one pass (10^3 km^3)
+    def sumVolume(mask):
+        volume,wsum,count = CK.weightedSums(thick,np.where(mask,area/1000.,
+                                                           np.nan))
+        volume = volume/1000.
+        volume[np.where(count == 0 if missing is None else missing)] = np.nan
+        return volume
+    
+    if regions is None:
+        volume = sumVolume(np.isfinite(area))
+    else:
+        volume = {}
+        for region in regions:
+            volume[region] = sumVolume(regions[region] & np.isfinite(area))
+    
+    return volume
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def readPiomasVolume(directory,years,threshold,regions=None):
+    """
+    Function reads PIOMAS thickness and grid cell area and returns monthly
+    sea ice volume. Results are cached in piomas_volume.npz and reused until
+    a thickness/grid file changes or different years/threshold/regions are
+    requested.
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    years : integers
+        years for data files
+    threshold : float
+        mask sea ice thickness amounts < to this value
+    regions : dictionary of 2d boolean arrays [lat,lon], optional
+        regional masks (True inside region)
+
+    Returns
+    -------
+    volume : 2d array [year,month] or dictionary of 2d arrays
+        total sea ice volume (10^3 km^3), per region if regions is given
+
+    Usage
+    -----
+    volume = readPiomasVolume(directory,years,threshold,regions)
+    """
+    
+    ### Import modules
+    import os
+    import hashlib
+    import read_SeaIceThick_PIOMAS as CT
+    import calc_PiomasArea as CA
+    
+    ### Signature of the inputs
+    files = [directory + 'griddata.txt'] + \
+            [directory + 'Thickness/heff_%s.H' % year for year in years]
+    signature = hashlib.md5()
+    for filename in files:
+        stat = os.stat(filename)
+        signature.update(('%s %s %s;' % (filename,stat.st_mtime,
+                                         stat.st_size)).encode())
+    signature.update(('%r;' % float(threshold)).encode())
+    names = ['total'] if regions is None else sorted(regions)
+    for name in names:
+        signature.update(name.encode())
+        if regions is not None:
+            signature.update(np.asarray(regions[name],dtype=bool).tobytes())
+    signature = signature.hexdigest()
+    
+    ### Use cached volume if inputs are unchanged
+    cachefile = directory + 'piomas_volume.npz'
+    if os.path.exists(cachefile):
+        try:
+            with np.load(cachefile) as cache:
+                if str(cache['signature']) == signature:
+                    LOGGER.info('Read cached sea ice volume!')
+                    addBytesRead(os.path.getsize(cachefile))
+                    if regions is None:
+                        return cache['total']
+                    return dict((name,cache[name]) for name in names)
+        except (IOError,OSError,ValueError,KeyError):
+            LOGGER.warning('Rebuilding unreadable cache "%s"' % cachefile)
+    
+    ### Calculate volume from gridded thickness
+    lats,lons,sit = CT.readPiomas(directory,years,threshold,dtype='float32')
+    area = CA.readPiomasArea(directory,dtype='float32')
+    volume = calcPiomasVolume(sit,area,None,regions)
+    
+    ### Save cache (atomic rename)
+    cached = {'total' : volume} if regions is None else dict(volume)
+    try:
+        tempfile = cachefile + '.%s.tmp' % os.getpid()
+        with open(tempfile,'wb') as f:
+            np.savez(f,signature=signature,**cached)
+        os.replace(tempfile,cachefile)
+    except (IOError,OSError):
+        LOGGER.warning('Could not write volume cache "%s"' % cachefile)
+    
+    return volume
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def validatePiomasVolume(directory,years,volume):
+    """
+    Function compares calculated volume against the PSC monthly_piomas.txt
+    product (10^3 km^3, -1 for missing months)
+
+    Parameters
+    ----------
+    directory : string
+        working directory with monthly_piomas.txt
+    years : integers
+        years of the calculated volume
+    volume : 2d array [year,month]
+        calculated sea ice volume (10^3 km^3)
+
+    Returns
+    -------
+    diff : 2d array [year,month]
+        calculated - monthly_piomas.txt (nan where either is missing)
+    stats : dictionary
+        bias, rmse and maximum absolute difference
+
+    Usage
+    -----
+    diff,stats = validatePiomasVolume(directory,years,volume)
+    """
+    
+    ### Import modules
+    import os
+    
+    data = np.genfromtxt(directory + 'monthly_piomas.txt')
+    addBytesRead(os.path.getsize(directory + 'monthly_piomas.txt'))
+    data = np.atleast_2d(data)
+    yearsq = data[:,0]
+    psc = data[:,1:13]
+    psc[np.where(psc < 0)] = np.nan
+    
+    ### Align years with the text product
+    diff = np.empty((len(years),12))
+    diff[:] = np.nan
+    for i in range(len(years)):
+        yr = np.where(yearsq == years[i])[0]
+        if yr.size:
+            diff[i,:] = volume[i,:] - psc[yr[0],:]
+    
+    stats = {'bias' : np.nanmean(diff),
+             'rmse' : np.sqrt(np.nanmean(diff**2)),
+             'maxabs' : np.nanmax(np.abs(diff))}
+    LOGGER.info('Bias ---> %.3f, RMSE ---> %.3f, Max |diff| ---> %.3f' \
+                % (stats['bias'],stats['rmse'],stats['maxabs']))
+    
+    return diff,stats
@@ -16,6 +16,8 @@ import matplotlib
 import datetime
 import read_SeaIceThick_PIOMAS as CT
 import calc_PiomasArea as CA
+import calc_SeaIceVolume_PIOMAS as CV
+import calc_Kernels as CK
 
 ### Define directories
 directorydata = './Data/'
@@ -38,16 +40,20 @@ months = [r'Jan',r'Feb',r'Mar',r'Apr',r'May',r'Jun',r'Jul',r'Aug',
           r'Sep',r'Oct',r'Nov',r'Dec']
 
 ### Call functions
-lats,lons,sit = CT.readPiomas(directorydata,years,0.15)
-area = CA.readPiomasArea(directorydata)
+lats,lons,sit = CT.readPiomas(directorydata,years,0.,dtype='float32')
+area = CA.readPiomasArea(directorydata,dtype='float32')
 
 ### Time
 print('\n' 'PIOMAS -- Sea Ice Volume --', \
         now.strftime("%Y-%m-%d %H:%M"), '\n' '\n')
 
-### Read data
-years2,aug = np.genfromtxt(directorydata + 'monthly_piomas.txt',
-                           unpack=True,delimiter='',usecols=[0,9])
+### Calculate September volume from gridded thickness and cell area
+volume = CV.calcPiomasVolume(sit,area)
+years2 = years
+aug = volume[:,8]
+
+### Mask thin ice for thickness averages
+sit[np.where(sit < 0.15)] = np.nan
 
 ### Calculate climatology from 1981-2010 baseline
 climyr = np.where((years2 >= 1981) & (years2 <= 2010))[0]  
@@ -63,14 +69,8 @@ def weightThick(var,area):
     Area weights sit array 4d [year,month,lat,lon] into [year,month] from
     original PIOMAS GOCC grid (area weighted)
     """
-    sityr = np.empty((var.shape[0],var.shape[1]))
-    for i in range(var.shape[0]):
-        for j in range(var.shape[1]):
-            varq = var[i,j,:,:]
-            mask = np.isfinite(varq) & np.isfinite(area)
-            varmask = varq[mask]#    plt.subplots_adjust(top=0.98)
-            areamask = area[mask]
-            sityr[i,j] = np.nansum(varmask*areamask)/np.sum(areamask)
+    total,areasum,count = CK.weightedSums(var,area)
+    sityr = total/areasum
      
     print('\nCompleted: Yearly weighted SIT average!')
     return sityr
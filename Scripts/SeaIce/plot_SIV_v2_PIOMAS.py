@@ -9,6 +9,7 @@ Date      : 7 November 2019
 
 ### Import modules
 import numpy as np
+import calc_DailyMatrix as DM
 import matplotlib.pyplot as plt
 import matplotlib.colors as c
 import datetime
@@ -35,11 +36,10 @@ currentdoy = now.timetuple().tm_yday
 
 month = datetime.date(int(currentyr),int(currentmn)-1,int(currentdy)).strftime('%B')
 
-### Reshape sea ice volumes arrays
-currentyear = volume.copy()[-day[-1]:]
-volumen = volume[:-day[-1]]
-
-volumen = np.reshape(volumen,(volumen.shape[0]//365,365))
+### Reshape sea ice volumes arrays ([year,day], nan after current day)
+volumeall,yearsall = DM.calcYearDayMatrix(volume,year,day,'truncate')
+currentyear = volumeall[-1,:day[-1]]
+volumen = volumeall[:-1]
 
 ### Calculate mean volume
 mean = np.nanmean(volumen,axis=0)
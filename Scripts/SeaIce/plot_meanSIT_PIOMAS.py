@@ -15,6 +15,7 @@ import matplotlib
 import datetime
 import read_SeaIceThick_PIOMAS as CT
 import calc_PiomasArea as CA
+import calc_PiomasStream as CS
 
 ### Directory and time
 directoryfigure = './Figures/'
@@ -37,31 +38,17 @@ months = [r'Jan',r'Feb',r'Mar',r'Apr',r'May',r'Jun',r'Jul',r'Aug',
           r'Sep',r'Oct',r'Nov',r'Dec']
 
 ### Call functions to read data
-lats,lons,sit = CT.readPiomas(directorydata,years,0.15)
-area = CA.readPiomasArea(directorydata)
+area = CA.readPiomasArea(directorydata,dtype='float32')
 
 ###########################################################################
 ###########################################################################
 ###########################################################################
-### Calculating temporal sit
-def weightThick(var,area):
-    """
-    Area weights sit array 4d [year,month,lat,lon] into [year,month] using 
-    original PIOMAS GOCC grid, which area-weights
-    """
-    sityr = np.empty((var.shape[0],var.shape[1]))
-    for i in range(var.shape[0]):
-        for j in range(var.shape[1]):
-            varq = var[i,j,:,:]
-            mask = np.isfinite(varq) & np.isfinite(area)
-            varmask = varq[mask]
-            areamask = area[mask]
-            sityr[i,j] = np.nansum(varmask*areamask)/np.sum(areamask)
-     
-    print('\nCompleted: Yearly weighted SIT average!') 
-    return sityr
-     
-sitave = weightThick(sit,area)
+### Calculating temporal sit (area weighted on original PIOMAS GOCC grid),
+### streaming one year at a time
+stream = CT.streamPiomas(directorydata,['thick'],years,0.15)
+years,reduced = CS.reduceStream(stream,{'sit' : CS.weightedAveReducer(area)})
+sitave = reduced['sit']
+print('\nCompleted: Yearly weighted SIT average!') 
 
 ###############################################################################
 ###############################################################################
@@ -11,6 +11,7 @@ import datetime
 import calendar as cal
 import matplotlib.colors as c
 import cmocean
+import read_SeaIceThick_PIOMAS as CT
 
 #### Define constants
 ### Directory and time
@@ -21,60 +22,8 @@ month = now.month
 years = np.arange(1979,2019,1)
 months = np.arange(1,13,1)
 
-def readPiomas(directory,vari,years,thresh):
-    """
-    Reads binary PIOMAS data
-    """
-    
-    ### Retrieve Grid
-    grid = np.genfromtxt(directory + 'grid.txt')
-    grid = np.reshape(grid,(grid.size))  
-    
-    ### Define Lat/Lon
-    lon = grid[:grid.size//2]   
-    lons = np.reshape(lon,(120,360))
-    lat = grid[grid.size//2:]
-    lats = np.reshape(lat,(120,360))
-    
-    ### Call variables from PIOMAS
-    if vari == 'thick':
-        files = 'heff'
-        directory = directory + 'Thickness/'
-    elif vari == 'sic':
-        files = 'area'
-        directory = directory + 'SeaIceConcentration/'
-    elif vari == 'snow':
-        files = 'snow'
-        directory = directory + 'SnowCover/'   
-    elif vari == 'oflux':
-        files = 'oflux'
-        directory = directory + 'OceanFlux/'
-    
-    ### Read data from binary into numpy arrays
-    var = np.empty((len(years),12,120,360))
-    for i in range(len(years)):
-        data = np.fromfile(directory + files + '_%s.H' % (years[i]),
-                           dtype = 'float32')
-
-    ### Reshape into [year,month,lat,lon]
-        months = int(data.shape[0]/(120*360))
-        if months != 12:
-            lastyearq = np.reshape(data,(months,120,360))
-            emptymo = np.empty((12-months,120,360))
-            emptymo[:,:,:] = np.nan
-            lastyear = np.append(lastyearq,emptymo,axis=0)
-            var[i,:,:,:] = lastyear
-        else:
-            dataq = np.reshape(data,(12,120,360))        
-            var[i,:,:,:] = dataq
-    
-    ### Mask out threshold values
-    var[np.where(var <= thresh)] = np.nan
-
-    print('Completed: Read "%s" data!' % (vari))   
-    
-    return lats,lons,var
-lats,lons,sit = readPiomas(directorydata,'thick',years,0.1)
+### Memory-map PIOMAS (only February is read from disk)
+lats,lons,sit = CT.readPiomasMemmap(directorydata,years,0.1)
 
 def colormapSIT():
     cmap1 = plt.get_cmap('BuPu')
@@ -0,0 +1,155 @@
+"""
+Script reads JAXA (AMSR2) daily Arctic sea ice extent (plot_extent_n_v2.csv)
+once and caches the parsed table as a binary file. The cache is reused while
+it is younger than maxage and is otherwise revalidated with the server
+(ETag/Last-Modified), so running all of the JAXA scripts downloads and
+parses the file once. A local file or directory can replace the url for
+offline runs.
+
+Notes
+-----
+    Source : https://ads.nipr.ac.jp/vishop/vishop-extent.html
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    dataset = readJAXAExtent(directory,maxage,source)
+"""
+
+import numpy as np
+from calc_Logging import LOGGER, logFunction, addBytesRead
+
+### JAXA daily extent (month,day,1980s,1990s,2000s means,2002-present)
+JAXAURL = 'https://ads.nipr.ac.jp/vishop.ver1/data/graph/plot_extent_n_v2.csv'
+JAXAFILE = 'plot_extent_n_v2.csv'
+
+def parseJAXAExtent(raw):
+    """
+    Parses the csv text (bytes) into an array with missing data as nan
+    """
+
+    ### Import modules
+    import io
+
+    dataset = np.genfromtxt(io.BytesIO(raw),skip_header=0,delimiter=",",)
+    dataset[np.where(dataset==-9999)] = np.nan
+    return dataset
+
+@logFunction
+def readJAXAExtent(directory='./Data/',maxage=10800.,source=None):
+    """
+    Function reads the JAXA daily sea ice extent table from a binary cache
+    (directory/JAXA_extent_n_v2.npz), refreshing it from the source when it
+    is older than maxage seconds. A stale cache is used if the source is
+    unreachable
+
+    Parameters
+    ----------
+    directory : string, optional
+        directory for the cache
+    maxage : float, optional
+        seconds before the cache is revalidated (0 always revalidates)
+    source : string, optional
+        url, local csv file or directory with plot_extent_n_v2.csv (default
+        environment variable JAXA_SOURCE, otherwise the JAXA url)
+
+    Returns
+    -------
+    dataset : 2d array [1+day,5+year]
+        columns are month, day, 1980s, 1990s and 2000s mean extent (km^2)
+        and the extent of each year from 2002 (km^2), missing data are nan
+        and the first row is the header
+
+    Usage
+    -----
+    dataset = readJAXAExtent(directory,maxage,source)
+    """
+
+    ### Import modules
+    import os
+    import time
+    import urllib.request
+    import urllib.error
+
+    if source is None:
+        source = os.environ.get('JAXA_SOURCE',JAXAURL)
+    if os.path.isdir(source):
+        source = os.path.join(source,JAXAFILE)
+    cachefile = directory + 'JAXA_extent_n_v2.npz'
+
+    ### Read cache (fast path if it is recent and from the same source)
+    cache = None
+    if os.path.exists(cachefile):
+        try:
+            with np.load(cachefile) as data:
+                cache = dict((key,data[key]) for key in data.files)
+            if str(cache['source']) != source:
+                cache = None
+            elif time.time() - float(cache['checked']) < maxage:
+                addBytesRead(cache['dataset'].nbytes)
+                return cache['dataset']
+        except (IOError,OSError,ValueError,KeyError):
+            LOGGER.warning('Rebuilding unreadable cache "%s"' % cachefile)
+            cache = None
+
+    ### Revalidate cache against the source
+    etag = '' if cache is None else str(cache['etag'])
+    modified = '' if cache is None else str(cache['modified'])
+    try:
+        if source.startswith('http'):
+            request = urllib.request.Request(source)
+            if etag:
+                request.add_header('If-None-Match',etag)
+            if modified:
+                request.add_header('If-Modified-Since',modified)
+            try:
+                response = urllib.request.urlopen(request,timeout=60)
+            except urllib.error.HTTPError as error:
+                if error.code != 304 or cache is None:
+                    raise
+                response = None
+            if response is None:
+                raw = None
+            else:
+                raw = response.read()
+                etag = response.headers.get('ETag') or ''
+                modified = response.headers.get('Last-Modified') or ''
+        else:
+            stat = os.stat(source)
+            validator = '%s %s' % (stat.st_mtime,stat.st_size)
+            if cache is not None and etag == validator:
+                raw = None
+            else:
+                with open(source,'rb') as f:
+                    raw = f.read()
+                etag,modified = validator,''
+    except (IOError,OSError) as error:
+        if cache is None:
+            raise
+        LOGGER.warning('Using stale JAXA cache (%s)' % error)
+        addBytesRead(cache['dataset'].nbytes)
+        return cache['dataset']
+
+    if raw is None:
+        LOGGER.info('JAXA extent is unchanged since the last download')
+        dataset = cache['dataset']
+        addBytesRead(dataset.nbytes)
+    else:
+        LOGGER.info('Parsing JAXA extent from "%s"' % source)
+        dataset = parseJAXAExtent(raw)
+        addBytesRead(len(raw))
+
+    ### Save cache (atomic rename)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        tempfile = cachefile + '.%s.tmp' % os.getpid()
+        with open(tempfile,'wb') as f:
+            np.savez(f,dataset=dataset,source=source,checked=time.time(),
+                     etag=etag,modified=modified)
+        os.replace(tempfile,cachefile)
+    except (IOError,OSError):
+        LOGGER.warning('Could not write JAXA cache "%s"' % cachefile)
+
+    return dataset
@@ -0,0 +1,511 @@
+"""
+Script reads NSIDC Sea Ice Index (G02135 v3.0) daily extent and 1981-2010
+climatology files for either hemisphere. Raw files are kept in a local
+cache (./Data/NSIDC/) and only fetched again when the cache is older than
+maxage and the source file has changed (FTP modification time/size or HTTP
+ETag/Last-Modified). Daily extent grows at the end, so only the new tail is
+fetched and parsed, and its rows are appended to a columnar store (date,
+extent and missing). Parsed climatologies are cached as binary files next
+to the raw files. A local mirror directory can replace the server for
+offline runs.
+
+Notes
+-----
+    Source : ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] fetchNSIDC(filename,hemisphere,directory,maxage,source,append)
+    [2] updateNSIDCStore(hemisphere,directory,maxage,source)
+    [3] readNSIDCDaily(hemisphere,directory,maxage,source)
+    [4] readNSIDCClimatology(hemisphere,directory,maxage,source)
+"""
+
+import numpy as np
+from calc_Logging import LOGGER, logFunction, addBytesRead
+
+### Sea Ice Index files ([N,S] for each hemisphere)
+NSIDCURL = 'ftp://sidads.colorado.edu/DATASETS/NOAA/G02135/'
+NSIDCDAILY = '%s_seaice_extent_daily_v3.0.csv'
+NSIDCCLIM = '%s_seaice_extent_climatology_1981-2010_v3.0.csv'
+
+### Bytes fetched again before the end of the cached file when appending
+### (covers revised recent rows) and days between fetches of the whole file
+OVERLAP = 4096
+REFETCH = 30*86400.
+
+### Columns of the daily extent store (date as YYYYMMDD)
+STORECOLUMNS = [('date','int32'),('extent','float64'),('missing','float64')]
+
+def saveAtomic(filename,write):
+    """
+    Writes a file through a temporary file and rename (write(f) fills it)
+    """
+
+    ### Import modules
+    import os
+
+    tempfile = filename + '.%s.tmp' % os.getpid()
+    with open(tempfile,'wb') as f:
+        write(f)
+    os.replace(tempfile,filename)
+
+def fetchTail(read,rawfile,append):
+    """
+    Reads the source from OVERLAP bytes before the end of the cached copy
+    (rows in the overlap may be revised, but its first line must match),
+    otherwise the whole file. read(start) returns the offset actually read
+    from and the bytes
+    """
+
+    ### Import modules
+    import os
+
+    start = 0
+    if append and os.path.exists(rawfile):
+        start = max(os.path.getsize(rawfile) - OVERLAP,0)
+    start,raw = read(start)
+
+    ### Earlier rows were changed (or the file was replaced)
+    if start > 0:
+        with open(rawfile,'rb') as f:
+            f.seek(start)
+            cached = f.read(OVERLAP)
+        cached = cached[:cached.find(b'\n') + 1] or cached
+        if raw[:len(cached)] != cached:
+            LOGGER.info('NSIDC file "%s" has changed, fetching all of it' \
+                        % rawfile)
+            start,raw = read(0)
+
+    return start,raw
+
+@logFunction
+def fetchNSIDC(filename,hemisphere='north',directory='./Data/',
+               maxage=86400.,source=None,append=False):
+    """
+    Function returns the path of a locally cached Sea Ice Index file,
+    fetching it when the cache is older than maxage seconds and the source
+    has changed. A stale cache is used if the source is unreachable
+
+    Parameters
+    ----------
+    filename : string
+        file name with %s for the hemisphere letter (e.g., NSIDCDAILY)
+    hemisphere : string, optional
+        'north' or 'south'
+    directory : string, optional
+        directory for the cache (files are kept in directory/NSIDC/)
+    maxage : float, optional
+        seconds before the source is checked again (0 always checks)
+    source : string, optional
+        ftp/http url of G02135 or a local mirror directory (default
+        environment variable NSIDC_SOURCE, otherwise the NSIDC ftp server)
+    append : boolean, optional
+        only fetch the bytes added since the last fetch (FTP REST or HTTP
+        Range) for files that grow at the end, such as the daily extent.
+        The whole file is fetched again every REFETCH seconds
+
+    Returns
+    -------
+    rawfile : string
+        path of the cached file
+
+    Usage
+    -----
+    rawfile = fetchNSIDC(filename,hemisphere,directory,maxage,source,append)
+    """
+
+    ### Import modules
+    import os
+    import json
+    import time
+    import ftplib
+    import urllib.request
+    import urllib.error
+    import urllib.parse
+
+    if hemisphere not in ('north','south'):
+        raise ValueError('Wrong hemisphere (north or south)!')
+    name = filename % hemisphere[0].upper()
+    if source is None:
+        source = os.environ.get('NSIDC_SOURCE',NSIDCURL)
+
+    ### Source of the file (mirror may keep the G02135 layout or be flat)
+    path = hemisphere + '/daily/data/' + name
+    if '://' in source:
+        sourcefile = source.rstrip('/') + '/' + path
+    else:
+        sourcefile = os.path.join(source,path)
+        if not os.path.exists(sourcefile):
+            sourcefile = os.path.join(source,name)
+
+    ### Cached file and its validator
+    cachedirectory = directory + 'NSIDC/'
+    rawfile = cachedirectory + name
+    metafile = rawfile + '.json'
+    meta = {}
+    if os.path.exists(rawfile) and os.path.exists(metafile):
+        try:
+            with open(metafile,'r') as f:
+                meta = json.load(f)
+        except (IOError,OSError,ValueError):
+            meta = {}
+    if meta.get('source') != sourcefile:
+        meta = {}
+    elif time.time() - meta.get('checked',0.) < maxage:
+        return rawfile
+
+    ### Check the source and fetch the file (or its tail) if it has changed
+    append = append and bool(meta) and \
+             time.time() - meta.get('fetched',0.) < REFETCH
+    validator = meta.get('validator')
+    start,raw = 0,None
+    try:
+        if sourcefile.startswith('ftp://'):
+            url = urllib.parse.urlparse(sourcefile)
+            ftp = ftplib.FTP(url.hostname,timeout=60)
+            def read(start):
+                chunks = []
+                try:
+                    ftp.retrbinary('RETR ' + url.path,chunks.append,
+                                   rest=start or None)
+                except ftplib.error_perm:
+                    if start == 0:
+                        raise
+                    return read(0)
+                return start,b''.join(chunks)
+            try:
+                ftp.login()
+                ftp.voidcmd('TYPE I')
+                modified = ftp.sendcmd('MDTM ' + url.path).split()[-1]
+                validator = '%s %s' % (modified,ftp.size(url.path))
+                if validator != meta.get('validator'):
+                    start,raw = fetchTail(read,rawfile,append)
+            finally:
+                ftp.close()
+        elif '://' in sourcefile:
+            def read(start):
+                request = urllib.request.Request(sourcefile)
+                if meta.get('etag'):
+                    request.add_header('If-None-Match',meta['etag'])
+                if meta.get('modified'):
+                    request.add_header('If-Modified-Since',meta['modified'])
+                if start > 0:
+                    request.add_header('Range','bytes=%s-' % start)
+                try:
+                    response = urllib.request.urlopen(request,timeout=60)
+                except urllib.error.HTTPError as error:
+                    if error.code != 416 or start == 0:
+                        raise
+                    return read(0)
+                if response.getcode() != 206:
+                    start = 0
+                meta['etag'] = response.headers.get('ETag') or ''
+                meta['modified'] = response.headers.get('Last-Modified') or ''
+                return start,response.read()
+            try:
+                start,raw = fetchTail(read,rawfile,append)
+                validator = '%s %s' % (meta['etag'],meta['modified'])
+            except urllib.error.HTTPError as error:
+                if error.code != 304 or not meta:
+                    raise
+        else:
+            stat = os.stat(sourcefile)
+            validator = '%s %s' % (stat.st_mtime,stat.st_size)
+            def read(start):
+                with open(sourcefile,'rb') as f:
+                    f.seek(start)
+                    return start,f.read()
+            if validator != meta.get('validator'):
+                start,raw = fetchTail(read,rawfile,append)
+    except ftplib.all_errors as error:
+        if not os.path.exists(rawfile):
+            raise
+        LOGGER.warning('Using stale NSIDC file "%s" (%s)' % (rawfile,error))
+        return rawfile
+
+    ### Save file (or write the tail in place) and validator
+    if not os.path.isdir(cachedirectory):
+        os.makedirs(cachedirectory)
+    if raw is not None:
+        LOGGER.info('Fetched %s bytes of NSIDC file "%s"' % (len(raw),
+                                                              sourcefile))
+        addBytesRead(len(raw))
+        if start > 0:
+            with open(rawfile,'r+b') as f:
+                f.seek(start)
+                f.write(raw)
+                f.truncate()
+        else:
+            saveAtomic(rawfile,lambda f: f.write(raw))
+            meta['fetched'] = time.time()
+    meta.update({'source' : sourcefile,'validator' : validator,
+                 'checked' : time.time()})
+    saveAtomic(metafile,lambda f: f.write(json.dumps(meta).encode()))
+
+    return rawfile
+
+def readNSIDCTable(rawfile,usecols):
+    """
+    Parses a Sea Ice Index csv (2 header lines) with missing data as nan,
+    using a binary cache ([rawfile].npz) invalidated on mtime/size change
+    """
+
+    ### Import modules
+    import os
+
+    stat = os.stat(rawfile)
+    cachefile = rawfile + '.npz'
+    if os.path.exists(cachefile):
+        try:
+            with np.load(cachefile) as cache:
+                if cache['mtime'] == stat.st_mtime and \
+                    cache['size'] == stat.st_size:
+                    dataset = cache['dataset']
+                    addBytesRead(dataset.nbytes)
+                    return dataset
+        except (IOError,OSError,ValueError,KeyError):
+            LOGGER.warning('Rebuilding unreadable cache "%s"' % cachefile)
+
+    dataset = np.genfromtxt(rawfile,skip_header=2,delimiter=',',
+                            usecols=usecols)
+    dataset[np.where(dataset==-9999)] = np.nan
+    addBytesRead(stat.st_size)
+    try:
+        saveAtomic(cachefile,lambda f: np.savez(f,dataset=dataset,
+                                                mtime=stat.st_mtime,
+                                                size=stat.st_size))
+    except (IOError,OSError):
+        LOGGER.warning('Could not write NSIDC cache "%s"' % cachefile)
+
+    return dataset
+
+@logFunction
+def updateNSIDCStore(hemisphere='north',directory='./Data/',maxage=86400.,
+                     source=None):
+    """
+    Function appends the days added to the daily Sea Ice Index file since
+    the last update to a columnar store (one binary file per column in
+    directory/NSIDC/[N,S]_extent_store/). Only the new tail of the file is
+    fetched and parsed, recent rows revised by NSIDC are written over and
+    the store is rebuilt when the whole file was fetched again
+
+    Parameters
+    ----------
+    hemisphere : string, optional
+        'north' or 'south'
+    directory : string, optional
+        directory for the cache
+    maxage : float, optional
+        seconds before the source is checked again
+    source : string, optional
+        ftp/http url of G02135 or a local mirror directory
+
+    Returns
+    -------
+    storedirectory : string
+        directory of the store
+
+    Usage
+    -----
+    storedirectory = updateNSIDCStore(hemisphere,directory,maxage,source)
+    """
+
+    ### Import modules
+    import os
+    import io
+    import json
+
+    rawfile = fetchNSIDC(NSIDCDAILY,hemisphere,directory,maxage,source,
+                         append=True)
+    storedirectory = directory + 'NSIDC/%s_extent_store/' \
+                     % hemisphere[0].upper()
+    storefile = storedirectory + 'store.json'
+
+    ### Store state and the fetch it was built from
+    try:
+        with open(rawfile + '.json','r') as f:
+            fetched = json.load(f).get('fetched')
+    except (IOError,OSError,ValueError):
+        fetched = None
+    try:
+        with open(storefile,'r') as f:
+            store = json.load(f)
+    except (IOError,OSError,ValueError):
+        store = {}
+    rows = store.get('rows',0)
+    valid = bool(store) and store.get('fetched') == fetched and all(
+                os.path.exists(storedirectory + column) and \
+                os.path.getsize(storedirectory + column) >= \
+                rows*np.dtype(dtype).itemsize
+                for column,dtype in STORECOLUMNS)
+
+    ### Complete rows from the last stored rows (whole file if rebuilding)
+    lines = []
+    if valid:
+        lines = readNSIDCRows(rawfile,store['start'])
+        kept = store['lines']
+        if kept and (not lines or lines[0] != kept[0]):
+            LOGGER.warning('NSIDC store "%s" does not match its file' \
+                           % storedirectory)
+            valid = False
+    if not valid:
+        LOGGER.info('Building NSIDC store "%s"' % storedirectory)
+        lines = readNSIDCRows(rawfile,None)
+        rows,kept = 0,[]
+
+    ### Keep stored rows that are unchanged (recent rows may be revised)
+    same = 0
+    while same < min(len(kept),len(lines)) and kept[same] == lines[same]:
+        same += 1
+    rows -= len(kept) - same
+    new = lines[same:]
+
+    ### Parse new rows only
+    data = np.empty((0,5))
+    if new:
+        text = ''.join(line for position,line in new).encode('latin-1')
+        data = np.genfromtxt(io.BytesIO(text),delimiter=',',
+                             usecols=[0,1,2,3,4]).reshape(-1,5)
+        data[np.where(data==-9999)] = np.nan
+    columns = {'date' : (data[:,0]*10000 + data[:,1]*100 + \
+                         data[:,2]).astype('int32'),
+               'extent' : data[:,3],
+               'missing' : data[:,4]}
+    LOGGER.info('NSIDC store: %s new or revised days after %s' \
+                % (len(data),store.get('last') if valid else None))
+
+    ### Append columns (writing over revised rows or an interrupted update)
+    if not os.path.isdir(storedirectory):
+        os.makedirs(storedirectory)
+    for column,dtype in STORECOLUMNS:
+        with open(storedirectory + column,'r+b' if valid else 'wb') as f:
+            f.seek(rows*np.dtype(dtype).itemsize)
+            f.write(columns[column].astype(dtype).tobytes())
+            f.truncate()
+    rows += len(data)
+
+    ### Keep the last rows covering the overlap fetched again next time
+    end = lines[-1][0] + len(lines[-1][1]) if lines else 0
+    first = len(lines) - 1
+    while first > 0 and end - lines[first][0] < OVERLAP + len(lines[-1][1]):
+        first -= 1
+    last = int(columns['date'][-1]) if len(data) else store.get('last')
+    store = {'fetched' : fetched,'rows' : rows,'last' : last,
+             'start' : lines[first][0] if lines else store.get('start'),
+             'lines' : lines[first:]}
+    saveAtomic(storefile,lambda f: f.write(json.dumps(store).encode()))
+
+    return storedirectory
+
+def readNSIDCRows(rawfile,start):
+    """
+    Reads the complete non-empty rows of a raw file from byte start (after
+    the 2 header lines if start is None) as [offset,text] pairs
+    """
+
+    with open(rawfile,'rb') as f:
+        if start is None:
+            f.readline()
+            f.readline()
+            start = f.tell()
+        f.seek(start)
+        tail = f.read()
+    tail = tail[:tail.rfind(b'\n') + 1]
+    addBytesRead(len(tail))
+
+    lines = []
+    for line in tail.splitlines(True):
+        if line.strip():
+            lines.append([start,line.decode('latin-1')])
+        start += len(line)
+    return lines
+
+def readNSIDCStore(storedirectory):
+    """
+    Reads the columns of a daily extent store into a dictionary of arrays
+    """
+
+    ### Import modules
+    import json
+
+    with open(storedirectory + 'store.json','r') as f:
+        rows = json.load(f)['rows']
+    columns = {}
+    for column,dtype in STORECOLUMNS:
+        columns[column] = np.fromfile(storedirectory + column,dtype=dtype,
+                                      count=rows)
+        addBytesRead(columns[column].nbytes)
+    return columns
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def readNSIDCDaily(hemisphere='north',directory='./Data/',maxage=86400.,
+                   source=None):
+    """
+    Function reads daily sea ice extent from the Sea Ice Index (updating the
+    columnar store with the days added since the last run)
+
+    Parameters
+    ----------
+    hemisphere : string, optional
+        'north' or 'south'
+    directory : string, optional
+        directory for the cache
+    maxage : float, optional
+        seconds before the source is checked again
+    source : string, optional
+        ftp/http url of G02135 or a local mirror directory
+
+    Returns
+    -------
+    dataset : 2d array [day,5]
+        year, month, day, extent (10^6 km^2) and missing (10^6 km^2) with
+        missing data as nan
+
+    Usage
+    -----
+    dataset = readNSIDCDaily(hemisphere,directory,maxage,source)
+    """
+
+    columns = readNSIDCStore(updateNSIDCStore(hemisphere,directory,maxage,
+                                              source))
+    date = columns['date']
+    return np.column_stack([date//10000,date//100 % 100,date % 100,
+                            columns['extent'],columns['missing']])
+
+@logFunction
+def readNSIDCClimatology(hemisphere='north',directory='./Data/',
+                         maxage=86400.,source=None):
+    """
+    Function reads the 1981-2010 daily climatology from the Sea Ice Index
+
+    Parameters
+    ----------
+    hemisphere : string, optional
+        'north' or 'south'
+    directory : string, optional
+        directory for the cache
+    maxage : float, optional
+        seconds before the source is checked again
+    source : string, optional
+        ftp/http url of G02135 or a local mirror directory
+
+    Returns
+    -------
+    dataset : 2d array [doy,8]
+        day of year, mean, standard deviation and 10th, 25th, 50th, 75th
+        and 90th percentiles of extent (10^6 km^2)
+
+    Usage
+    -----
+    dataset = readNSIDCClimatology(hemisphere,directory,maxage,source)
+    """
+
+    rawfile = fetchNSIDC(NSIDCCLIM,hemisphere,directory,maxage,source)
+    return readNSIDCTable(rawfile,[0,1,2,3,4,5,6,7])
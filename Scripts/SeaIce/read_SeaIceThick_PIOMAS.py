@@ -12,9 +12,346 @@ Notes
 Usage
 -----
     readPIOMAS(directory,years,threshold)
+    readPiomasGrid(directory)
+    readPiomasVars(directory,varis,years,threshold,workers,dtype)
+    readPiomasMemmap(directory,years,threshold,vari)
+    streamPiomas(directory,varis,years,threshold)
+    updatePiomasStore(directory,years,vari)
+    readPiomasStore(directory,years,vari)
 """
 
-def readPiomas(directory,years,threshold):
+import numpy as np
+import calc_PiomasArea as CA
+from calc_Logging import LOGGER, logFunction, addBytesRead
+
+### PIOMAS variables -> (file prefix, subdirectory)
+PIOMASVARS = {'thick' : ('heff','Thickness/'),
+              'sic' : ('area','SeaIceConcentration/'),
+              'snow' : ('snow','SnowCover/'),
+              'oflux' : ('oflux','OceanFlux/')}
+
+@logFunction
+def readPiomasGrid(directory):
+    """
+    Function reads PIOMAS grid.txt into 2d latitudes and longitudes. The
+    parsed grid is cached in grid.txt.npz
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+
+    Returns
+    -------
+    lats : 2d array
+        latitudes
+    lons : 2d array
+        longitudes
+
+    Usage
+    -----
+    lats,lons = readPiomasGrid(directory)
+    """
+    
+    ### Retrieve Grid (binary cache of grid.txt)
+    grid = CA.PiomasGrid(directory)
+    
+    return grid.lats,grid.lons
+
+def readPiomasBinary(directory,vari,year):
+    """
+    Function reads one PIOMAS binary file into [month,lat,lon]
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    vari : string
+        variable to read ('thick','sic','snow','oflux')
+    year : integer
+        year of data file
+
+    Returns
+    -------
+    data : 3d array [month,lat,lon]
+        float32 months available in the file
+
+    Usage
+    -----
+    data = readPiomasBinary(directory,vari,year)
+    """
+    
+    files,subdirectory = PIOMASVARS[vari]
+    data = np.fromfile(directory + subdirectory + files + '_%s.H' % (year),
+                       dtype = 'float32')
+    addBytesRead(data.nbytes)
+    
+    ### Reshape into [month,lat,lon]
+    months = data.shape[0]//(120*360)
+    if data.shape[0] != months*120*360 or months > 12:
+        raise ValueError('Issue with reshaping %s array from binary' % vari)
+    
+    return np.reshape(data,(months,120,360))
+
+def printPiomasMonths(vari,years,i,months):
+    """
+    Logs the last available month for a partial year
+    """
+    
+    ### Import modules
+    import datetime
+    
+    if months != 12:
+        month = datetime.date(years[i],max(months,1),1).strftime('%B')
+        LOGGER.info('%s data available through ---> "%s"' % (vari,month))
+        LOGGER.info('%s data available from ---> (%s - %s)' \
+                    % (vari,np.nanmin(years),np.nanmax(years)))
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+def piomasStoreFile(directory,vari):
+    """
+    Returns the file name of the consolidated store for a PIOMAS variable
+    """
+    return directory + 'piomas_%s.nc' % PIOMASVARS[vari][0]
+
+@logFunction
+def updatePiomasStore(directory,years,vari='thick'):
+    """
+    Function creates or refreshes a consolidated netCDF4 store of a PIOMAS
+    variable [year,month,lat,lon] (chunked by month). Only binaries whose
+    mtime/size changed since the last refresh are re-ingested, so a daily
+    refresh only rewrites the current year.
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    years : integers
+        years for data files
+    vari : string, optional
+        variable to store ('thick','sic','snow','oflux')
+
+    Returns
+    -------
+    storefile : string
+        path to the consolidated store
+
+    Usage
+    -----
+    storefile = updatePiomasStore(directory,years,vari)
+    """
+    
+    ### Import modules
+    import os
+    from netCDF4 import Dataset
+    
+    files,subdirectory = PIOMASVARS[vari]
+    storefile = piomasStoreFile(directory,vari)
+    
+    ### Create store
+    if not os.path.exists(storefile):
+        data = Dataset(storefile,'w',format='NETCDF4')
+        data.description = 'PIOMAS %s [year,month,lat,lon]' % files
+        data.createDimension('year',None)
+        data.createDimension('month',12)
+        data.createDimension('lat',120)
+        data.createDimension('lon',360)
+        data.createVariable('year','i4',('year',))
+        data.createVariable('months','i4',('year',))
+        data.createVariable('mtime','f8',('year',))
+        data.createVariable('size','i8',('year',))
+        data.createVariable(vari,'f4',('year','month','lat','lon'),
+                            chunksizes=(1,1,120,360),fill_value=np.nan)
+        data.close()
+    
+    data = Dataset(storefile,'a')
+    data.set_auto_mask(False)
+    stored = list(data.variables['year'][:])
+    mtime = data.variables['mtime'][:]
+    size = data.variables['size'][:]
+    
+    ### Re-ingest only new or changed binaries
+    updated = 0
+    for year in years:
+        stat = os.stat(directory + subdirectory + files + '_%s.H' % (year))
+        if year in stored:
+            i = stored.index(year)
+            if mtime[i] == stat.st_mtime and size[i] == stat.st_size:
+                continue
+        else:
+            i = len(stored)
+            stored.append(year)
+        
+        var = readPiomasBinary(directory,vari,year)
+        months = var.shape[0]
+        data.variables[vari][i,:months,:,:] = var
+        if months != 12:
+            data.variables[vari][i,months:,:,:] = np.nan
+        data.variables['year'][i] = year
+        data.variables['months'][i] = months
+        data.variables['mtime'][i] = stat.st_mtime
+        data.variables['size'][i] = stat.st_size
+        updated += 1
+    data.close()
+    
+    LOGGER.info('Updated %s of %s years in "%s"' \
+                % (updated,len(years),storefile))
+    return storefile
+
+@logFunction
+def readPiomasStore(directory,years,vari='thick'):
+    """
+    Function reads years from the consolidated store of a PIOMAS variable
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    years : integers
+        years for data files
+    vari : string, optional
+        variable to read ('thick','sic','snow','oflux')
+
+    Returns
+    -------
+    var : 4d array [year,month,lat,lon]
+        selected variable (nan for missing months)
+    months : 1d array
+        number of months available per year
+
+    Usage
+    -----
+    var,months = readPiomasStore(directory,years,vari)
+    """
+    
+    ### Import modules
+    from netCDF4 import Dataset
+    
+    data = Dataset(piomasStoreFile(directory,vari),'r')
+    data.set_auto_mask(False)
+    stored = list(data.variables['year'][:])
+    storedmonths = data.variables['months'][:]
+    
+    var = np.empty((len(years),12,120,360),dtype='float32')
+    months = np.empty((len(years)),dtype=int)
+    for i in range(len(years)):
+        if years[i] not in stored:
+            data.close()
+            raise ValueError('Year %s is not in the %s store!' \
+                             % (years[i],vari))
+        j = stored.index(years[i])
+        var[i] = data.variables[vari][j]
+        months[i] = storedmonths[j]
+    data.close()
+    addBytesRead(var.nbytes)
+    
+    return var,months
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def readPiomasVars(directory,varis,years,threshold,workers=None,
+                   dtype='float64'):
+    """
+    Function reads any subset of PIOMAS variables (thickness, concentration,
+    snow and ocean flux) in a single pass over the years. The grid is read
+    once and all variables are aligned on [year,month,lat,lon]. Variables
+    with a consolidated store (see updatePiomasStore) are refreshed and read
+    from the store instead of the binaries.
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    varis : list of strings
+        variables to read ('thick','sic','snow','oflux')
+    years : integers
+        years for data files
+    threshold : float
+        mask sea ice thickness amounts < to this value (thickness only)
+    workers : integer, optional
+        number of threads reading binaries concurrently (default sequential)
+    dtype : string, optional
+        output dtype ('float32' keeps the precision of the binaries and
+        halves memory)
+
+    Returns
+    -------
+    lats : 2d array
+        latitudes
+    lons : 2d array
+        longitudes
+    var : dictionary of 4d arrays [year,month,lat,lon]
+        keyed by variable name
+
+    Usage
+    -----
+    lats,lons,var = readPiomasVars(directory,varis,years,threshold,workers,
+                                   dtype)
+    """
+    
+    ### Import modules
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+    
+    ### Check variables
+    for vari in varis:
+        if vari not in PIOMASVARS:
+            raise ValueError('Unknown PIOMAS variable "%s"!' % vari)
+    
+    ### Retrieve Grid
+    lats,lons = readPiomasGrid(directory)
+    
+    ### Read data from binary into numpy arrays
+    var = {}
+    for vari in varis:
+        var[vari] = np.empty((len(years),12,120,360),dtype=dtype)
+    
+    ### Variables with a consolidated store are read from it
+    storevaris = [vari for vari in varis \
+                  if os.path.exists(piomasStoreFile(directory,vari))]
+    for vari in storevaris:
+        updatePiomasStore(directory,years,vari)
+        var[vari][:],monthsvari = readPiomasStore(directory,years,vari)
+        for i in range(len(years)):
+            printPiomasMonths(vari,years,i,monthsvari[i])
+    
+    ### Read binaries straight into [year,month,lat,lon]
+    def readYear(task):
+        i,vari = task
+        data = readPiomasBinary(directory,vari,years[i])
+        months = data.shape[0]
+        var[vari][i,:months,:,:] = data
+        var[vari][i,months:,:,:] = np.nan
+        return months
+    
+    tasks = [(i,vari) for i in range(len(years)) for vari in varis \
+             if vari not in storevaris]
+    if workers is None or workers <= 1:
+        LOGGER.info('Currently reading PIOMAS data!')
+        months = [readYear(task) for task in tasks]
+    else:
+        LOGGER.info('Currently reading PIOMAS data (%s workers)!' % workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            months = list(pool.map(readYear,tasks))
+        addBytesRead(sum(months)*120*360*4)
+    for task,monthsi in zip(tasks,months):
+        printPiomasMonths(task[1],years,task[0],monthsi)
+    
+    ### Mask out threshold values
+    if 'thick' in var:
+        var['thick'][np.where(var['thick'] < threshold)] = np.nan
+        LOGGER.info('Masking SIT data < %s m!' % threshold)
+    
+    return lats,lons,var
+
+@logFunction
+def readPiomas(directory,years,threshold,workers=None,dtype='float64'):
     """
     Function reads PIOMAS binary and converts to standard numpy array.
 
@@ -26,6 +363,10 @@ def readPiomas(directory,years,threshold):
         years for data files
     threshold : float
         mask sea ice thickness amounts < to this value
+    workers : integer, optional
+        number of threads reading binaries concurrently (default sequential)
+    dtype : string, optional
+        output dtype ('float32' keeps the precision of the binaries)
 
     Returns
     -------
@@ -38,67 +379,186 @@ def readPiomas(directory,years,threshold):
 
     Usage
     -----
-    lats,lons,var = readPiomas(directory,years,threshold)
+    lats,lons,var = readPiomas(directory,years,threshold,workers,dtype)
     """
     
-    print('\n>>> Using readPiomas function!\n')
+    lats,lons,var = readPiomasVars(directory,['thick'],years,threshold,
+                                   workers,dtype)
     
-    ### Import modules
-    import numpy as np
-    import datetime
+    return lats,lons,var['thick']
+###############################################################################
+###############################################################################
+###############################################################################
+
+def streamPiomas(directory,varis,years,threshold,dtype='float32'):
+    """
+    Function yields PIOMAS data one year at a time, so memory does not grow
+    with the number of years. Partial years are padded with nan.
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    varis : list of strings
+        variables to read ('thick','sic','snow','oflux')
+    years : integers
+        years for data files
+    threshold : float
+        mask sea ice thickness amounts < to this value (thickness only)
+    dtype : string, optional
+        dtype of the yielded blocks
+
+    Yields
+    ------
+    year : integer
+        year of the block
+    var : dictionary of 3d arrays [month,lat,lon]
+        keyed by variable name
+
+    Usage
+    -----
+    for year,var in streamPiomas(directory,varis,years,threshold):
+    """
     
-    ### Current times
-    now = datetime.datetime.now()
-    mo = now.month
-    yr = now.year
-    dy = now.day
+    for i in range(len(years)):
+        var = {}
+        for vari in varis:
+            data = readPiomasBinary(directory,vari,years[i])
+            months = data.shape[0]
+            var[vari] = np.empty((12,120,360),dtype=dtype)
+            var[vari][:months,:,:] = data
+            var[vari][months:,:,:] = np.nan
+            printPiomasMonths(vari,years,i,months)
+        
+        ### Mask out threshold values
+        if 'thick' in var:
+            var['thick'][np.where(var['thick'] < threshold)] = np.nan
+        
+        yield years[i],var
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+class LazyPiomas(object):
+    """
+    Lazy [year,month,lat,lon] view of memory-mapped PIOMAS binaries. Only
+    the bytes of the selected years/months/grid points are read when the
+    view is indexed. Months missing from a partial year are filled with nan
+    and values < threshold are masked as in readPiomas.
+
+    Usage
+    -----
+    sitfeb = var[:,1,:,:]
+    """
     
-    ### Retrieve Grid
-    grid = np.genfromtxt(directory + 'grid.txt')
-    grid = np.reshape(grid,(grid.size))  
+    def __init__(self,maps,threshold):
+        self.maps = maps
+        self.threshold = threshold
+        self.shape = (len(maps),12,120,360)
+        self.ndim = 4
+        self.dtype = np.dtype('float32')
+        
+    def __len__(self):
+        return self.shape[0]
     
-    ### Define Lat/Lon
-    lon = grid[:grid.size//2]   
-    lons = np.reshape(lon,(120,360))
-    lat = grid[grid.size//2:]
-    lats = np.reshape(lat,(120,360))
+    def __array__(self,dtype=None):
+        var = self[:,:,:,:]
+        if dtype is not None:
+            var = var.astype(dtype)
+        return var
+        
+    def __getitem__(self,key):
+        ### Expand key to [year,month,lat,lon]
+        if not isinstance(key,tuple):
+            key = (key,)
+        ellipsis = [i for i in range(len(key)) if key[i] is Ellipsis]
+        if ellipsis:
+            i = ellipsis[0]
+            key = key[:i] + (slice(None),)*(5-len(key)) + key[i+1:]
+        if len(key) > 4:
+            raise IndexError('Too many indices for [year,month,lat,lon]!')
+        key = key + (slice(None),)*(4-len(key))
+        yrkey,mokey,latkey,lonkey = key
+        
+        ### Resolve years/months and grid shape of the selection
+        yrs = np.arange(self.shape[0])[yrkey]
+        mos = np.arange(self.shape[1])[mokey]
+        gridshape = np.empty(self.shape[2:],dtype=bool)[latkey,lonkey].shape
+        
+        ### Copy selected bytes only (nan for missing months)
+        var = np.empty((np.size(yrs),np.size(mos)) + gridshape,
+                       dtype=self.dtype)
+        var[:] = np.nan
+        for i,yr in enumerate(np.atleast_1d(yrs)):
+            data = self.maps[yr]
+            for j,mo in enumerate(np.atleast_1d(mos)):
+                if mo < data.shape[0]:
+                    var[i,j] = data[mo][latkey,lonkey]
+                    addBytesRead(var[i,j].nbytes)
+        
+        ### Mask out threshold values
+        var[np.where(var < self.threshold)] = np.nan
+        
+        ### Drop integer-indexed dimensions
+        if np.ndim(mos) == 0:
+            var = var[:,0]
+        if np.ndim(yrs) == 0:
+            var = var[0]
+        return var
+
+@logFunction
+def readPiomasMemmap(directory,years,threshold,vari='thick'):
+    """
+    Function memory-maps PIOMAS binaries and returns a lazy array. Selecting
+    a year, month or latitude band only reads those bytes from disk.
+
+    Parameters
+    ----------
+    directory : string
+        working directory for stored PIOMAS files
+    years : integers
+        years for data files
+    threshold : float
+        mask amounts < to this value
+    vari : string, optional
+        variable to map ('thick','sic','snow','oflux')
+
+    Returns
+    -------
+    lats : 2d array
+        latitudes
+    lons : 2d array
+        longitudes
+    var : LazyPiomas [year,month,lat,lon]
+        selected variable as float32 when indexed
+
+    Usage
+    -----
+    lats,lons,var = readPiomasMemmap(directory,years,threshold,vari)
+    """
     
-    ### Call variables from PIOMAS
-    files = 'heff'
-    directory = directory + 'Thickness/'
+    ### Retrieve Grid
+    lats,lons = readPiomasGrid(directory)
     
-    ### Read data from binary into numpy arrays
-    var = np.empty((len(years),12,120,360))
+    ### Call variables from PIOMAS
+    files,subdirectory = PIOMASVARS[vari]
+    directory = directory + subdirectory
     
-    print('Currently reading PIOMAS data!')
+    ### Memory-map binaries as [month,lat,lon]
+    maps = []
+    LOGGER.info('Currently mapping PIOMAS data!')
     for i in range(len(years)):
-        data = np.fromfile(directory + files + '_%s.H' % (years[i]),
-                           dtype = 'float32')
-
-    ### Reshape into [year,month,lat,lon]
+        filename = directory + files + '_%s.H' % (years[i])
+        data = np.memmap(filename,dtype='float32',mode='r')
         months = data.shape[0]//(120*360)
-        if months != 12:
-            lastyearq = np.reshape(data,(months,120,360))
-            emptymo = np.empty((12-months,120,360))
-            emptymo[:,:,:] = np.nan
-            lastyear = np.append(lastyearq,emptymo,axis=0)
-            var[i,:,:,:] = lastyear
-            
-            month = datetime.date(yr, months, dy).strftime('%B')
-            print('\nSIT data available through ---> "%s"' % month)
-            print('SIT data available from ---> (%s - %s)' \
-                    % (np.nanmin(years),np.nanmax(years)))
-            
-        elif months == 12:
-            dataq = np.reshape(data,(12,120,360))        
-            var[i,:,:,:] = dataq
-        else:
-            ValueError('Issue with reshaping SIT array from binary')
+        if data.shape[0] != months*120*360 or months > 12:
+            raise ValueError('Issue with reshaping %s array from binary' \
+                             % vari)
+        maps.append(np.reshape(data,(months,120,360)))
+        printPiomasMonths(vari,years,i,months)
     
-    ### Mask out threshold values
-    var[np.where(var < threshold)] = np.nan
-    print('\nMasking SIT data < %s m!' % threshold)
-
-    print('\n*Completed: Read SIT data!')   
+    var = LazyPiomas(maps,threshold)
+    LOGGER.info('Masking %s data < %s!' % (vari,threshold))
     
-    return lats,lons,var
\ No newline at end of file
+    return lats,lons,var
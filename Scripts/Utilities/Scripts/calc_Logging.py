@@ -0,0 +1,235 @@
+"""
+Functions log and time calls of the reader/utility functions. Messages go
+to the 'IceVarFigs' logger, which is silent unless enableLogging is called
+(or a script configures logging). Per-call records of wall time, bytes read
+and array sizes are only kept while recording is on and can be exported as
+JSON. Setting the environment variable ICEVARFIGS_PROFILE=[file.json]
+records a whole run and writes the file at exit.
+
+Notes
+-----
+    Author : Zachary Labe
+    Date   : 18 October 2026
+
+Usage
+-----
+    [1] logFunction(func)
+    [2] addBytesRead(nbytes)
+    [3] enableLogging(level,filename)
+    [4] startRecording()
+    [5] stopRecording()
+    [6] getRecords(clear)
+    [7] exportRecords(filename)
+"""
+
+import logging
+import threading
+
+### Silent by default (no output unless a handler is configured)
+LOGGER = logging.getLogger('IceVarFigs')
+LOGGER.addHandler(logging.NullHandler())
+
+### Call records [logFunction]
+RECORDS = []
+RECORDING = {'on' : False}
+ACTIVE = threading.local()
+
+def arraySizes(variables):
+    """
+    Returns shapes and total bytes of the arrays in a list of variables
+    (also looks inside tuples, lists and dictionaries)
+    """
+
+    shapes = []
+    nbytes = 0
+    stack = list(variables)
+    while stack:
+        var = stack.pop(0)
+        if isinstance(var,(tuple,list)):
+            stack.extend(var)
+        elif isinstance(var,dict):
+            stack.extend(var.values())
+        elif hasattr(var,'shape') and hasattr(var,'dtype'):
+            shapes.append([int(i) for i in var.shape])
+            nbytes += int(getattr(var,'nbytes',0))
+    return shapes,nbytes
+
+def addBytesRead(nbytes):
+    """
+    Adds bytes read from disk to every function call being recorded in
+    this thread (readers call this after reading a file)
+
+    Usage
+    -----
+    addBytesRead(data.nbytes)
+    """
+
+    for record in getattr(ACTIVE,'records',[]):
+        record['bytes_read'] += int(nbytes)
+
+def logFunction(func):
+    """
+    Decorator logs the start and end of a function call (level INFO) and,
+    while recording, keeps the wall time, bytes read and sizes of array
+    arguments/results of the call
+
+    Usage
+    -----
+    @logFunction
+    def readPiomas(directory,years,threshold):
+    """
+
+    ### Import modules
+    import functools
+    import time
+
+    @functools.wraps(func)
+    def wrapper(*args,**kwargs):
+        if not RECORDING['on']:
+            if not LOGGER.isEnabledFor(logging.INFO):
+                return func(*args,**kwargs)
+            LOGGER.info('>>> Using %s function!' % func.__name__)
+            start = time.time()
+            result = func(*args,**kwargs)
+            LOGGER.info('*Completed: Finished %s function (%.3f s)!' \
+                        % (func.__name__,time.time() - start))
+            return result
+
+        LOGGER.info('>>> Using %s function!' % func.__name__)
+        shapes,nbytes = arraySizes(list(args) + list(kwargs.values()))
+        record = {'function' : func.__name__,
+                  'module' : func.__module__,
+                  'thread' : threading.current_thread().name,
+                  'start' : time.time(),
+                  'bytes_read' : 0,
+                  'input_shapes' : shapes,
+                  'input_bytes' : nbytes}
+        if not hasattr(ACTIVE,'records'):
+            ACTIVE.records = []
+        ACTIVE.records.append(record)
+
+        clock = time.perf_counter()
+        try:
+            result = func(*args,**kwargs)
+        finally:
+            record['wall_time'] = time.perf_counter() - clock
+            ACTIVE.records.pop()
+            RECORDS.append(record)
+
+        shapes,nbytes = arraySizes([result])
+        record['output_shapes'] = shapes
+        record['output_bytes'] = nbytes
+        LOGGER.info('*Completed: Finished %s function (%.3f s, %s bytes ' \
+                    'read)!' % (func.__name__,record['wall_time'],
+                                record['bytes_read']))
+        return result
+    return wrapper
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+def enableLogging(level='INFO',filename=None):
+    """
+    Function prints (or writes to a file) messages of the 'IceVarFigs'
+    logger at a given level
+
+    Parameters
+    ----------
+    level : string, optional
+        logging level ('DEBUG','INFO','WARNING')
+    filename : string, optional
+        write messages to a file instead of the terminal
+
+    Usage
+    -----
+    enableLogging(level,filename)
+    """
+
+    if filename is None:
+        handler = logging.StreamHandler()
+    else:
+        handler = logging.FileHandler(filename)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s ' \
+                                           '%(message)s'))
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(level)
+
+def startRecording():
+    """
+    Function starts keeping per-call records (wall time, bytes, sizes)
+    """
+    RECORDING['on'] = True
+
+def stopRecording():
+    """
+    Function stops keeping per-call records
+    """
+    RECORDING['on'] = False
+
+def getRecords(clear=False):
+    """
+    Function returns the per-call records and a summary per function
+
+    Parameters
+    ----------
+    clear : boolean, optional
+        empty the records after returning them
+
+    Returns
+    -------
+    records : list of dictionaries
+        one record per call
+    summary : dictionary
+        calls, total wall time and total bytes read keyed by function
+
+    Usage
+    -----
+    records,summary = getRecords(clear)
+    """
+
+    records = list(RECORDS)
+    summary = {}
+    for record in records:
+        name = record['module'] + '.' + record['function']
+        if name not in summary:
+            summary[name] = {'calls' : 0,'wall_time' : 0.,'bytes_read' : 0}
+        summary[name]['calls'] += 1
+        summary[name]['wall_time'] += record['wall_time']
+        summary[name]['bytes_read'] += record['bytes_read']
+    if clear:
+        del RECORDS[:]
+
+    return records,summary
+
+def exportRecords(filename):
+    """
+    Function writes the per-call records and summary to a JSON file
+
+    Parameters
+    ----------
+    filename : string
+        path of the JSON file
+
+    Usage
+    -----
+    exportRecords(filename)
+    """
+
+    ### Import modules
+    import json
+
+    records,summary = getRecords()
+    with open(filename,'w') as f:
+        json.dump({'summary' : summary,'records' : records},f,indent=1)
+    LOGGER.info('Wrote %s call records to "%s"' % (len(records),filename))
+
+### Record a whole run (e.g., nightly figures) without changing scripts
+def profileRun():
+    import atexit
+    import os
+    filename = os.environ.get('ICEVARFIGS_PROFILE')
+    if filename and not RECORDING['on']:
+        startRecording()
+        atexit.register(exportRecords,filename)
+profileRun()
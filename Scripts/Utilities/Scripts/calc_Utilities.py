@@ -10,12 +10,114 @@ Usage
 -----
     [1] calcDecJan(varx,vary,lat,lon,level,levsq)
     [2] calcDecJanFeb(varx,vary,lat,lon,level,levsq)
-    [3] calc_indttest(varx,vary)
-    [4] calc_weightedAve(var,lats)
+    [3] calc_indttest(varx,vary,equal_var,fdr,tilesize,workers)
+    [4] calc_weightedAve(var,lats,area)
     [5] calc_spatialCorr(varx,vary,lats,lons,weight)
     [6] calc_RMSE(varx,vary,lats,lons,weight)
+    [7] calc_latWeights(lats)
+    [8] calc_weightedMean(var,weights)
+    [9] calc_seasonalMean(varx,vary,months)
+    [10] calc_spatialCorrBatch(varx,vary,lats,lons,weight,pairs)
+    [11] calc_gridWeights(lats,lons,weight)
+    [12] calc_errorMetrics(varx,vary,lats,lons,weight)
+    [13] calc_ttestTiles(varx,vary,equal_var,tilesize,workers)
+    [14] calc_fdr(pvalue,alpha)
+    [15] calc_arrayModule(variables)
+    [16] calc_ttestKernel(varx,vary,equal_var)
 """
 
+from calc_Logging import LOGGER, logFunction
+
+### Cache of cos(lat) weights [calc_latWeights]
+LATWEIGHTS = {}
+
+### Cache of normalized grid weights [calc_gridWeights]
+GRIDWEIGHTS = {}
+
+def calc_arrayModule(*variables):
+    """
+    Returns dask.array if any variable is a (chunked, lazy) dask array and
+    numpy otherwise, so the same functions work out-of-core
+
+    Usage
+    -----
+    xp = calc_arrayModule(varx,vary)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    for var in variables:
+        if type(var).__module__.split('.')[0] == 'dask':
+            import dask.array as da
+            return da
+    return np
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
+def calc_seasonalMean(varx,vary,months):
+    """
+    Function calculates the average over any window of months, including
+    windows that wrap into the following year (e.g., NDJ, DJFM). Months are
+    read as strided views of [year,month,...] and averaged (ignoring nans)
+    without looping over years
+
+    Parameters
+    ----------
+    varx : 4d array or 5d array
+        [year,month,lat,lon] or [year,month,lev,lat,lon]
+    vary : 4d array or 5d array
+        [year,month,lat,lon] or [year,month,lev,lat,lon]
+    months : list of integers
+        months in the window in order (1-12), e.g. [12,1,2] for DJF
+        
+    Returns
+    -------
+    varx_s : 3d array or 4d array
+        [year,lat,lon] or [year,lev,lat,lon]
+    vary_s : 3d array or 4d array
+        [year,lat,lon] or [year,lev,lat,lon]
+
+    Usage
+    -----
+    varx_s,vary_s = calc_seasonalMean(varx,vary,months)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    ### Year offset of each month (window wraps when months decrease)
+    offsets = [0]
+    for i in range(1,len(months)):
+        offsets.append(offsets[-1] + int(months[i] <= months[i-1]))
+    if any([mo < 1 or mo > 12 for mo in months]) or offsets[-1] > 1:
+        raise ValueError('Months must be 1-12 and span at most 2 years!')
+    
+    ### Accumulate sum and count of finite values per month
+    seasonal = []
+    for var in [varx,vary]:
+        xp = calc_arrayModule(var)
+        years = var.shape[0] - offsets[-1]
+        total = 0.
+        count = 0
+        for mo,offset in zip(months,offsets):
+            varmo = var[offset:offset+years,mo-1]
+            finite = xp.isfinite(varmo)
+            total = total + xp.where(finite,varmo,0.)
+            count = count + finite
+        with np.errstate(invalid='ignore',divide='ignore'):
+            seasonal.append(total/count)
+    
+    return seasonal[0],seasonal[1]
+
+###############################################################################
+###############################################################################
+###############################################################################
+
+@logFunction
 def calcDecJan(varx,vary,lat,lon,level,levsq):
     """
     Function calculates average for December-January
@@ -46,73 +148,18 @@ def calcDecJan(varx,vary,lat,lon,level,levsq):
     -----
     varx_dj,vary_dj = calcDecJan(varx,vary,lat,lon,level,levsq)
     """
-    print('\n>>> Using calcDecJan function!')
+    if level not in ('surface','profile'):
+        LOGGER.error('Selected wrong height - (surface or profile!)!')
     
-    ### Import modules
-    import numpy as np
+    varx_dj,vary_dj = calc_seasonalMean(varx,vary,[12,1])
     
-    ### Reshape for 3d variables
-    if level == 'surface':    
-        varxravel = np.reshape(varx.copy(),
-                           (int(varx.shape[0]*12),
-                            int(lat.shape[0]),int(lon.shape[0])))
-        varyravel = np.reshape(vary.copy(),
-                               (int(vary.shape[0]*12),
-                                int(lat.shape[0]),int(lon.shape[0]))) 
-                               
-        varx_dj = np.empty((varx.shape[0]-1,lat.shape[0],lon.shape[0]))
-        vary_dj = np.empty((vary.shape[0]-1,lat.shape[0],lon.shape[0]) )                 
-        for i in range(0,varxravel.shape[0]-12,12):
-            counter = 0
-            if i >= 12:
-                counter = i//12
-            djappendh = np.append(varxravel[11+i,:,:],varxravel[12+i,:,:])
-            djappendf = np.append(varyravel[11+i,:,:],varyravel[12+i,:,:])    
-            varx_dj[counter,:,:] = np.nanmean(np.reshape(djappendh,
-                                    (2,int(lat.shape[0]),int(lon.shape[0]))),
-                                    axis=0)                   
-            vary_dj[counter,:,:] = np.nanmean(np.reshape(djappendf,
-                                    (2,int(lat.shape[0]),int(lon.shape[0]))),
-                                    axis=0)
-    ### Reshape for 4d variables
-    elif level == 'profile':
-        varxravel = np.reshape(varx.copy(),
-                           (int(varx.shape[0]*12.),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])))
-        varyravel = np.reshape(vary.copy(),
-                               (int(vary.shape[0]*12.),levsq,
-                                int(lat.shape[0]),int(lon.shape[0]))) 
-                               
-        varx_dj = np.empty((int(varx.shape[0]-1),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])))
-        vary_dj = np.empty((int(vary.shape[0]-1),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])) )                 
-        for i in range(0,varxravel.shape[0]-12,12):
-            counter = 0
-            if i >= 12:
-                counter = i//12
-            djappendh = np.append(varxravel[11+i,:,:,:],
-                                  varxravel[12+i,:,:,:])
-            djappendf = np.append(varyravel[11+i,:,:,:],
-                                  varyravel[12+i,:,:,:])    
-            varx_dj[counter,:,:] = np.nanmean(np.reshape(djappendh,
-                                    (2,levsq,int(lat.shape[0]),
-                                     int(lon.shape[0]))),axis=0)                   
-            vary_dj[counter,:,:] = np.nanmean(np.reshape(djappendf,
-                                    (2,levsq,int(lat.shape[0]),
-                                     int(lon.shape[0]))),axis=0)                               
-    else:
-        print(ValueError('Selected wrong height - (surface or profile!)!'))    
-                                
-    print('Completed: Organized data by months (ON,DJ,FM)!')
-
-    print('*Completed: Finished calcDecJan function!')
     return varx_dj,vary_dj
 
 ###############################################################################
 ###############################################################################
 ###############################################################################
 
+@logFunction
 def calcDecJanFeb(varx,vary,lat,lon,level,levsq):
     """
     Function calculates average for December-January-February
@@ -143,80 +190,163 @@ def calcDecJanFeb(varx,vary,lat,lon,level,levsq):
     -----
     varx_djf,vary_djf = calcDecJanFeb(varx,vary,lat,lon,level,levsq)
     """
-    print('\n>>> Using calcDecJan function!')
+    if level not in ('surface','profile'):
+        LOGGER.error('Selected wrong height - (surface or profile!)!')
     
-    ### Import modules
-    import numpy as np
+    varx_djf,vary_djf = calc_seasonalMean(varx,vary,[12,1,2])
     
-    ### Reshape for 3d variables
-    if level == 'surface':    
-        varxravel = np.reshape(varx.copy(),
-                           (int(varx.shape[0]*12),
-                            int(lat.shape[0]),int(lon.shape[0])))
-        varyravel = np.reshape(vary.copy(),
-                               (int(vary.shape[0]*12),
-                                int(lat.shape[0]),int(lon.shape[0]))) 
-                               
-        varx_djf = np.empty((varx.shape[0]-1,lat.shape[0],lon.shape[0]))
-        vary_djf = np.empty((vary.shape[0]-1,lat.shape[0],lon.shape[0]) )                 
-        for i in range(0,varxravel.shape[0]-12,12):
-            counter = 0
-            if i >= 12:
-                counter = i//12
-            djfappendh1 = np.append(varxravel[11+i,:,:],varxravel[12+i,:,:])
-            djfappendf1 = np.append(varyravel[11+i,:,:],varyravel[12+i,:,:])  
-            djfappendh = np.append(djfappendh1,varxravel[13+i,:,:])
-            djfappendf = np.append(djfappendf1,varyravel[13+i,:,:]) 
-            varx_djf[counter,:,:] = np.nanmean(np.reshape(djfappendh,
-                                    (3,int(lat.shape[0]),int(lon.shape[0]))),
-                                    axis=0)                   
-            vary_djf[counter,:,:] = np.nanmean(np.reshape(djfappendf,
-                                    (3,int(lat.shape[0]),int(lon.shape[0]))),
-                                    axis=0)
-    ### Reshape for 4d variables
-    elif level == 'profile':
-        varxravel = np.reshape(varx.copy(),
-                           (int(varx.shape[0]*12.),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])))
-        varyravel = np.reshape(vary.copy(),
-                               (int(vary.shape[0]*12.),levsq,
-                                int(lat.shape[0]),int(lon.shape[0]))) 
-                               
-        varx_djf = np.empty((int(varx.shape[0]-1),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])))
-        vary_djf = np.empty((int(vary.shape[0]-1),levsq,
-                            int(lat.shape[0]),int(lon.shape[0])) )                 
-        for i in range(0,varxravel.shape[0]-12,12):
-            counter = 0
-            if i >= 12:
-                counter = i//12
-            djfappendh1 = np.append(varxravel[11+i,:,:,:],
-                                  varxravel[12+i,:,:,:])
-            djfappendf1 = np.append(varyravel[11+i,:,:,:],
-                                  varyravel[12+i,:,:,:]) 
-            djfappendh = np.append(djfappendh1,
-                                  varxravel[13+i,:,:,:])
-            djfappendf = np.append(djfappendf1,
-                                  varyravel[13+i,:,:,:])  
-            varx_djf[counter,:,:] = np.nanmean(np.reshape(djfappendh,
-                                    (3,levsq,int(lat.shape[0]),
-                                     int(lon.shape[0]))),axis=0)                   
-            vary_djf[counter,:,:] = np.nanmean(np.reshape(djfappendf,
-                                    (3,levsq,int(lat.shape[0]),
-                                     int(lon.shape[0]))),axis=0)                               
-    else:
-        print(ValueError('Selected wrong height - (surface or profile!)!'))    
-                                
-    print('Completed: Organized data by months (DJF)!')
-
-    print('*Completed: Finished calcDecJanFeb function!')
     return varx_djf,vary_djf
 
 ###############################################################################
 ###############################################################################
 ###############################################################################
     
-def calc_indttest(varx,vary):
+def calc_ttestKernel(varx,vary,equal_var=True):
+    """
+    Independent 2-sample t-test for [sample,...] numpy arrays (nans are
+    removed by counting finite samples). Returns a [4,...] array of the
+    t-statistic, two-tailed p-value and finite samples of varx and vary
+
+    Usage
+    -----
+    ttest = calc_ttestKernel(varx,vary,equal_var)
+    """
+    
+    ### Import modules
+    import numpy as np
+    import calc_Kernels as CK
+    from scipy.special import stdtr
+    
+    ### Moments of finite samples [point]
+    shape = np.shape(varx)[1:]
+    nx,mx,ssx = CK.nanMoments(np.reshape(varx,(np.shape(varx)[0],-1)))
+    ny,my,ssy = CK.nanMoments(np.reshape(vary,(np.shape(vary)[0],-1)))
+    nx,mx,ssx,ny,my,ssy = [np.reshape(moment,shape) for moment in \
+                           [nx,mx,ssx,ny,my,ssy]]
+    with np.errstate(invalid='ignore',divide='ignore'):
+        if equal_var:
+            df = nx + ny - 2
+            sp = (ssx + ssy)/df
+            se = np.sqrt(sp*(1/nx + 1/ny))
+        else:
+            ex = ssx/(nx - 1)/nx
+            ey = ssy/(ny - 1)/ny
+            se = np.sqrt(ex + ey)
+            df = (ex + ey)**2/(ex**2/(nx - 1) + ey**2/(ny - 1))
+        t = (mx - my)/se
+    df = np.where(df > 0,df,np.nan)
+    
+    return np.stack([t,2*stdtr(df,-np.abs(t)),nx,ny])
+
+@logFunction
+def calc_ttestTiles(varx,vary,equal_var=True,tilesize=None,workers=None):
+    """
+    Function calculates an independent 2-sample t-test (Student or Welch)
+    at every gridpoint. Gridpoints are processed in tiles to bound memory
+    and nans are removed by counting finite samples per gridpoint. Dask 
+    arrays are tested lazily chunk by chunk (the sample axis is rechunked
+    into one chunk)
+
+    Parameters
+    ----------
+    varx : nd array [sample,...]
+    vary : nd array [sample,...]
+    equal_var : boolean, optional
+        True for Student's t-test, False for Welch's t-test
+    tilesize : integer, optional
+        gridpoints per tile (default about 64 MB of data per tile)
+    workers : integer, optional
+        number of threads processing tiles (default 1)
+    
+    Returns
+    -------
+    stat : calculated t-statistic [...]
+    pvalue : two-tailed p-value [...]
+    nx : finite samples of varx [...]
+    ny : finite samples of vary [...]
+
+    Usage
+    -----
+    stat,pvalue,nx,ny = calc_ttestTiles(varx,vary,equal_var,tilesize,workers)
+    """
+    
+    ### Import modules
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    
+    ### Lazy test over chunks of gridpoints
+    xp = calc_arrayModule(varx,vary)
+    if xp is not np:
+        varx = xp.asarray(varx)
+        varx = varx.rechunk((-1,) + varx.chunks[1:])
+        vary = xp.asarray(vary).rechunk((-1,) + varx.chunks[1:])
+        ttest = xp.map_blocks(calc_ttestKernel,varx,vary,equal_var,
+                              chunks=((4,),) + varx.chunks[1:],dtype=float)
+        return ttest[0],ttest[1],ttest[2],ttest[3]
+    
+    ### Flatten gridpoints [sample,point]
+    shape = varx.shape[1:]
+    varx = np.reshape(varx,(varx.shape[0],-1))
+    vary = np.reshape(vary,(vary.shape[0],-1))
+    points = varx.shape[1]
+    if tilesize is None:
+        tilesize = max(1,int(64e6//(8*(varx.shape[0] + vary.shape[0]))))
+    
+    ttest = np.empty((4,points))
+    def tile(start):
+        tq = slice(start,min(start + tilesize,points))
+        ttest[:,tq] = calc_ttestKernel(varx[:,tq],vary[:,tq],equal_var)
+    
+    starts = range(0,points,tilesize)
+    if workers is None or workers <= 1:
+        for start in starts:
+            tile(start)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(tile,starts))
+    
+    ttest = np.reshape(ttest,(4,) + shape)
+    return ttest[0],ttest[1],ttest[2],ttest[3]
+
+def calc_fdr(pvalue,alpha):
+    """
+    Function finds field significance with the false discovery rate
+    (Benjamini-Hochberg; Wilks 2016) over all gridpoints
+
+    Parameters
+    ----------
+    pvalue : nd array of p-values (nans are ignored)
+    alpha : float
+        global (field) significance level, e.g. 0.05 or 0.10
+    
+    Returns
+    -------
+    significant : nd boolean array
+
+    Usage
+    -----
+    significant = calc_fdr(pvalue,alpha)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    ### Critical p-value needs every gridpoint (computes lazy p-values)
+    pvalues = np.asarray(pvalue)
+    psort = np.sort(pvalues[np.isfinite(pvalues)])
+    threshold = alpha*np.arange(1,psort.size+1)/psort.size
+    below = np.where(psort <= threshold)[0]
+    pcrit = psort[below[-1]] if below.size else -np.inf
+    
+    if calc_arrayModule(pvalue) is np:
+        pvalue = pvalues
+    with np.errstate(invalid='ignore'):
+        significant = pvalue <= pcrit
+    return significant
+
+@logFunction
+def calc_indttest(varx,vary,equal_var=True,fdr=None,tilesize=None,
+                  workers=None):
     """
     Function calculates statistical difference for 2 independent
     sample t-test
@@ -225,6 +355,11 @@ def calc_indttest(varx,vary):
     ----------
     varx : 3d array
     vary : 3d array
+    equal_var : boolean, optional (False for Welch's t-test)
+    fdr : float, optional (field significance level with false discovery
+          rate instead of 95% at each gridpoint)
+    tilesize : integer, optional (gridpoints per tile)
+    workers : integer, optional (threads processing tiles)
     
     Returns
     -------
@@ -235,34 +370,106 @@ def calc_indttest(varx,vary):
     -----
     stat,pvalue = calc_ttest(varx,vary)
     """
-    print('\n>>> Using calc_ttest function!')
-    
     ### Import modules
     import numpy as np
-    import scipy.stats as sts
     
     ### 2-independent sample t-test
-    stat,pvalue = sts.ttest_ind(varx,vary,nan_policy='omit')
+    stat,pvalue,nx,ny = calc_ttestTiles(varx,vary,equal_var,tilesize,
+                                        workers)
     
-    ### Significant at 95% confidence level
-    pvalue[np.where(pvalue >= 0.05)] = np.nan
-    pvalue[np.where(pvalue < 0.05)] = 1.
+    ### Significant at 95% confidence level (or field significance)
+    xp = calc_arrayModule(pvalue)
+    if fdr is None:
+        with np.errstate(invalid='ignore'):
+            significant = pvalue < 0.05
+    else:
+        significant = calc_fdr(pvalue,fdr)
+    pvalue = xp.where(significant,1.,np.nan)
     
-    print('*Completed: Finished calc_ttest function!')
     return stat,pvalue
 
 ###############################################################################
 ###############################################################################
 ###############################################################################
 
-def calc_weightedAve(var,lats):
+def calc_latWeights(lats):
+    """
+    Cosine of latitude weights, cached per latitude grid
+    
+    Parameters
+    ----------
+    lats : 1d or 2d array of latitudes
+    
+    Returns
+    -------
+    gw : array of weights (same shape as lats)
+
+    Usage
+    -----
+    gw = calc_latWeights(lats)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    lats = np.asarray(lats)
+    key = (lats.shape,lats.dtype.str,lats.tobytes())
+    if key not in LATWEIGHTS:
+        gw = np.cos(np.deg2rad(lats))
+        gw.setflags(write=False)
+        LATWEIGHTS[key] = gw
+    return LATWEIGHTS[key]
+
+def calc_weightedMean(var,weights):
     """
-    Area weights sit array 5d [ens,year,month,lat,lon] into [ens,year,month]
+    Weighted mean over the last two dimensions [lat,lon] for any number of
+    leading dimensions. Missing values (var or weights) are removed by
+    setting their weight to zero
+    
+    Parameters
+    ----------
+    var : nd array [...,lat,lon]
+    weights : 2d array [lat,lon] (cos(lat) or grid cell area)
+    
+    Returns
+    -------
+    meanvar : weighted average [...]
+
+    Usage
+    -----
+    meanvar = calc_weightedMean(var,weights)
+    """
+    
+    ### Import modules
+    import numpy as np
+    import calc_Kernels as CK
+    
+    xp = calc_arrayModule(var)
+    if xp is np:
+        ### One pass over the grid (compiled if numba is installed)
+        total,wsum,count = CK.weightedSums(var,weights)
+    else:
+        valid = xp.isfinite(var) & np.isfinite(weights)
+        gw = xp.where(valid,weights,0)
+        total = xp.sum(xp.where(valid,var,0)*gw,axis=(-2,-1),
+                       dtype='float64')
+        wsum = xp.sum(gw,axis=(-2,-1),dtype='float64')
+    with np.errstate(invalid='ignore',divide='ignore'):
+        meanvar = total/wsum
+    return meanvar
+
+@logFunction
+def calc_weightedAve(var,lats,area=None):
+    """
+    Area weights sit array 5d [ens,year,month,lat,lon] into [ens,year,month].
+    float32 input is kept as float32 and only the sums are accumulated in
+    float64
     
     Parameters
     ----------
     var : 5d,4d,3d array of a gridded variable
     lats : 2d array of latitudes
+    area : 2d array of grid cell area (optional, replaces cos(lat) weights)
     
     Returns
     -------
@@ -270,61 +477,136 @@ def calc_weightedAve(var,lats):
 
     Usage
     -----
-    meanvar = calc_weightedAve(var,lats)
+    meanvar = calc_weightedAve(var,lats,area)
     """
-    print('\n>>> Using calc_weightedAve function!')
-    
     ### Import modules
     import numpy as np
     
     ### Calculate weighted average for various dimensional arrays
-    if var.ndim == 5:
-        meanvar = np.empty((var.shape[0],var.shape[1],var.shape[2]))
-        for ens in range(var.shape[0]):
-            for i in range(var.shape[1]):
-                for j in range(var.shape[2]):
-                    varq = var[ens,i,j,:,:]
-                    mask = np.isfinite(varq) & np.isfinite(lats)
-                    varmask = varq[mask]
-                    areamask = np.cos(np.deg2rad(lats[mask]))
-                    meanvar[ens,i,j] = np.nansum(varmask*areamask) \
-                                        /np.sum(areamask)  
-    elif var.ndim == 4:
-        meanvar = np.empty((var.shape[0],var.shape[1]))
-        for i in range(var.shape[0]):
-            for j in range(var.shape[1]):
-                varq = var[i,j,:,:]
-                mask = np.isfinite(varq) & np.isfinite(lats)
-                varmask = varq[mask]
-                areamask = np.cos(np.deg2rad(lats[mask]))
-                meanvar[i,j] = np.nansum(varmask*areamask)/np.sum(areamask)
-    elif var.ndim == 3:
-        meanvar = np.empty((var.shape[0]))
-        for i in range(var.shape[0]):
-            varq = var[i,:,:]
-            mask = np.isfinite(varq) & np.isfinite(lats)
-            varmask = varq[mask]
-            areamask = np.cos(np.deg2rad(lats[mask]))
-            meanvar[i] = np.nansum(varmask*areamask)/np.sum(areamask)
-    elif var.ndim == 2:
-        meanvar = np.empty((var.shape[0]))
-        varq = var[:,:]
-        mask = np.isfinite(varq) & np.isfinite(lats)
-        varmask = varq[mask]
-        areamask = np.cos(np.deg2rad(lats[mask]))
-        meanvar = np.nansum(varmask*areamask)/np.sum(areamask)
+    if var.ndim >= 2:
+        if area is None:
+            weights = calc_latWeights(lats)
+        else:
+            weights = np.where(np.isfinite(lats),area,np.nan)
+        meanvar = calc_weightedMean(var,weights)
     else:
-        print(ValueError('Variable has the wrong dimensions!'))
-     
-    print('Completed: Weighted variable average!')
+        LOGGER.error('Variable has the wrong dimensions!')
     
-    print('*Completed: Finished calc_weightedAve function!')
     return meanvar
 
 ###############################################################################
 ###############################################################################
 ###############################################################################
     
+def calc_gridWeights(lats,lons,weight):
+    """
+    Normalized weights (sum to 1) for spatial correlations and errors, 
+    cached per (lats,lons,weight). Weighted calculations mask latitudes 
+    <= 30N and use cos(lat)
+    
+    Parameters
+    ----------
+    lats : 1d array of latitude
+    lons : 1d array of longitude
+    weight : string (yes or no)
+    
+    Returns
+    -------
+    latq : 1d array of latitude indices used
+    gw : 2d array [lat,lon] of normalized weights
+    
+    Usage
+    -----
+    latq,gw = calc_gridWeights(lats,lons,weight)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    lats = np.asarray(lats)
+    lons = np.asarray(lons)
+    key = (weight,lats.dtype.str,lats.tobytes(),lons.dtype.str,lons.tobytes())
+    if key in GRIDWEIGHTS:
+        return GRIDWEIGHTS[key]
+    
+    if weight == 'yes':
+        latq = np.where(lats > 30)[0]
+        lon2,lat2 = np.meshgrid(lons,lats[latq])
+        gw = calc_latWeights(lat2)
+    elif weight == 'no':
+        latq = np.arange(len(lats))
+        gw = np.ones((len(lats),len(lons)))
+    else:
+        raise ValueError('Wrong weighted arguement in function!')
+    gw = gw/np.sum(gw)
+    gw.setflags(write=False)
+    
+    GRIDWEIGHTS[key] = (latq,gw)
+    return latq,gw
+
+@logFunction
+def calc_spatialCorrBatch(varx,vary,lats,lons,weight,pairs='slice'):
+    """
+    Calculates spatial correlations (pearson r) for stacks of 2d fields in
+    one vectorized call, using normalized weights and single-pass moments
+    
+    Parameters
+    ----------
+    varx : nd array [...,lat,lon]
+    vary : nd array [...,lat,lon]
+    lats : 1d array of latitude
+    lons : 1d array of longitude
+    weight : string (yes or no)
+    pairs : string (slice or all)
+        slice correlates matching slices of varx and vary (broadcasting),
+        all correlates every slice of varx with every slice of vary
+    
+    Returns
+    -------
+    corrcoef : nd array of correlation coefficients
+        [...] for slice or [...x,...y] for all
+    
+    Usage
+    -----
+    corrcoef = calc_spatialCorrBatch(varx,vary,lats,lons,weight,pairs)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    latq,gw = calc_gridWeights(lats,lons,weight)
+    gw = gw.ravel()
+    
+    ### Flatten grid [...,lat*lon]
+    xp = calc_arrayModule(varx,vary)
+    varx = xp.asarray(varx)[...,latq,:]
+    vary = xp.asarray(vary)[...,latq,:]
+    varx = xp.reshape(varx,varx.shape[:-2] + (gw.size,))
+    vary = xp.reshape(vary,vary.shape[:-2] + (gw.size,))
+    
+    ### Shift by first grid point (r is unchanged, limits cancellation)
+    varx = varx - varx[...,:1]
+    vary = vary - vary[...,:1]
+    
+    ### Weighted moments
+    mx = xp.tensordot(varx,gw,axes=1)
+    my = xp.tensordot(vary,gw,axes=1)
+    sxx = xp.tensordot(varx**2,gw,axes=1) - mx**2
+    syy = xp.tensordot(vary**2,gw,axes=1) - my**2
+    if pairs == 'slice':
+        sxy = xp.tensordot(varx*vary,gw,axes=1) - mx*my
+    elif pairs == 'all':
+        mx = xp.reshape(mx,mx.shape + (1,)*my.ndim)
+        sxx = xp.reshape(sxx,sxx.shape + (1,)*syy.ndim)
+        sxy = xp.tensordot(varx*gw,vary,axes=([-1],[-1])) - mx*my
+    else:
+        raise ValueError('Wrong pairs arguement in function!')
+    
+    corrcoef = sxy/xp.sqrt(sxx*syy)
+    
+    return corrcoef
+
+@logFunction
 def calc_spatialCorr(varx,vary,lats,lons,weight):
     """
     Calculates spatial correlation from pearson correlation coefficient
@@ -345,64 +627,57 @@ def calc_spatialCorr(varx,vary,lats,lons,weight):
     corrcoef = calc_spatialCorr(varx,vary,lats,lons)
     """
     
-    print('\n>>> Using calc_spatialCorr function!')
-    ### Import modules
-    import numpy as np
-    
-    if weight == 'yes': # Computed weighted correlation coefficient   
-        ### mask 
-        mask = 'yes'
-        if mask == 'yes':
-            latq = np.where(lats > 30)[0]
-            lats = lats[latq]
-            varx = varx[latq,:]
-            vary = vary[latq,:]
-            print('MASKING LATITUDES!')
-        
-        ### Create 2d meshgrid for weights 
-        lon2,lat2 = np.meshgrid(lons,lats)
-        
-        ### Create 2d array of weights based on latitude
-        gw = np.cos(np.deg2rad(lat2))
-        
-        def m(x, w):
-            """Weighted Mean"""
+    corrcoef = calc_spatialCorrBatch(varx,vary,lats,lons,weight)
     
-            wave = np.sum(x * w) / np.sum(w)
-            print('Completed: Computed weighted average!') 
-            return wave
-        
-        def cov(x, y, w):
-            """Weighted Covariance"""
-            
-            wcov = np.sum(w * (x - m(x, w)) * (y - m(y, w))) / np.sum(w)
-            print('Completed: Computed weighted covariance!')
-            return wcov
-        
-        def corr(x, y, w):
-            """Weighted Correlation"""
-            
-            wcor = cov(x, y, w) / np.sqrt(cov(x, x, w) * cov(y, y, w))
-            print('Completed: Computed weighted correlation!')
-            return wcor
-        
-        corrcoef = corr(varx,vary,gw)
-        
-    elif weight == 'no':   
-        ### Correlation coefficient from numpy function (not weighted)
-        corrcoef= np.corrcoef(varx.ravel(),vary.ravel())[0][1]
-        print('Completed: Computed NON-weighted correlation!')
-        
-    else:
-        ValueError('Wrong weighted arguement in function!')
-    
-    print('*Completed: Finished calc_SpatialCorr function!')
     return corrcoef
 
 ###############################################################################
 ###############################################################################
 ###############################################################################
 
+@logFunction
+def calc_errorMetrics(varx,vary,lats,lons,weight):
+    """
+    Calculates weighted root mean square error, bias (mean error) and mean
+    absolute error for stacks of 2d fields in one vectorized call
+    
+    Parameters
+    ----------
+    varx : nd array [...,lat,lon]
+    vary : nd array [...,lat,lon]
+    lats : 1d array of latitude
+    lons : 1d array of longitude
+    weight : string (yes or no)
+    
+    Returns
+    -------
+    rmse : nd array [...]
+    bias : nd array [...] (varx - vary)
+    mae : nd array [...]
+    
+    Usage
+    -----
+    rmse,bias,mae = calc_errorMetrics(varx,vary,lats,lons,weight)
+    """
+    
+    ### Import modules
+    import numpy as np
+    
+    latq,gw = calc_gridWeights(lats,lons,weight)
+    gw = gw.ravel()
+    
+    ### Flatten grid of errors [...,lat*lon]
+    xp = calc_arrayModule(varx,vary)
+    err = xp.asarray(varx)[...,latq,:] - xp.asarray(vary)[...,latq,:]
+    err = xp.reshape(err,err.shape[:-2] + (gw.size,))
+    
+    rmse = xp.sqrt(xp.tensordot(err**2,gw,axes=1))
+    bias = xp.tensordot(err,gw,axes=1)
+    mae = xp.tensordot(xp.abs(err),gw,axes=1)
+    
+    return rmse,bias,mae
+
+@logFunction
 def calc_RMSE(varx,vary,lats,lons,weight):
         """
         Calculates root mean square weighted average
@@ -423,38 +698,6 @@ def calc_RMSE(varx,vary,lats,lons,weight):
         rmse = calc_RMSE(varx,vary,lats,lons)
         """
         
-        print('\n>>> Using calc_RMSE function!')
-        ### Import modules
-        import numpy as np
-        from sklearn.metrics import mean_squared_error
-        
-        if weight == 'yes': # Computed weighted correlation coefficient   
-            ### mask
-            mask = 'yes'
-            if mask == 'yes':
-                latq = np.where(lats > 30)[0]
-                lats = lats[latq]
-                varx = varx[latq,:]
-                vary = vary[latq,:]
-                print('MASKING LATITUDES!')
-            
-            ### Create 2d meshgrid for weights 
-            lon2,lat2 = np.meshgrid(lons,lats)
-            
-            ### Create 2d array of weights based on latitude
-            gw = np.cos(np.deg2rad(lat2))
-            
-            ### Calculate rmse 
-            sq_err = (varx - vary)**2
-            rmse = np.sqrt((np.sum(sq_err*gw))/np.sum(gw))
-     
-        elif weight == 'no':   
-            ### Root mean square error from sklearn (not weighted)
-            rmse = np.sqrt(mean_squared_error(varx.ravel(),vary.ravel()))
-            print('Completed: Computed NON-weighted correlation!')
-            
-        else:
-            ValueError('Wrong weighted arguement in function!')
+        rmse,bias,mae = calc_errorMetrics(varx,vary,lats,lons,weight)
         
-        print('*Completed: Finished calc_RMSE function!')
-        return rmse
\ No newline at end of file
+        return rmse